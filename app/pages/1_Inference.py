@@ -1,7 +1,8 @@
 import pandas as pd
 import streamlit as st
 
-from src.inference import predict
+from src.inference import predict_and_explain
+from src.schema import InvalidInputError
 
 st.title("Customer Preference Prediction")
 
@@ -18,7 +19,7 @@ with col1:
 
 
 with col2:
-    gender = st.selectbox("Gender", ["Male", "Female"]).lower()
+    gender = st.selectbox("Gender", ["Male", "Female"])
     health_adults = st.number_input(
         "Health Dependents (Adults)", min_value=0, max_value=10, value=1
     )
@@ -39,7 +40,7 @@ col3, col4, col5 = st.columns(3)
 with col3:
     motor_insurance = st.selectbox("Motor Insurance", ["Yes", "No"])
     motor_type = st.selectbox("Motor Type", ["Single", "Bundle"])
-    motor_value = st.number_input("Motor Value", min_value=0, max_value=200000, value=15000)
+    motor_value = st.number_input("Motor Value", min_value=0, max_value=100000, value=15000)
 
 with col4:
     health_insurance = st.selectbox("Health Insurance", ["Yes", "No"])
@@ -73,7 +74,7 @@ features = {
 # ----------------------------
 if st.button("Predict Preference"):
     try:
-        predicted_label, proba_map = predict(features)
+        predicted_label, proba_map, df_why = predict_and_explain(features)
 
         st.success(f"Predicted Contact Preference: **{predicted_label}**")
 
@@ -94,6 +95,17 @@ if st.button("Predict Preference"):
             # Show numeric values below chart
             st.dataframe(df_probs.transpose().style.format({"Probability": "{:.3f}"}))
 
+        # Per-feature contributions to the predicted class (log-odds)
+        st.subheader(f"Why {predicted_label}?")
+        st.caption(
+            "Positive values pushed the model towards this preference, negative values away from it."
+        )
+        st.bar_chart(df_why, horizontal=True)
+
+    except InvalidInputError as e:
+        # input rejected by the model's schema
+        st.error(str(e))
+
     except Exception as e:
         st.error("Prediction failed.")
         st.exception(e)
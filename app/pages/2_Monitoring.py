@@ -1,12 +1,152 @@
+from typing import Any
+
 import streamlit as st
 
-from src.config import MONITORING_DIR
+from monitoring.dashboard import (
+    IncrementalFrame,
+    drift_share_over_time,
+    feature_drift_frequency,
+    in_range,
+    label_mix,
+    prediction_volume,
+)
+from monitoring.reports import load_report_html
+from src.supabase import fetch_monitoring_metrics, fetch_prediction_labels
+
+CACHE_TTL_SECONDS = 300
+
+RANGES: dict[str, int | None] = {
+    "Last 7 days": 7,
+    "Last 30 days": 30,
+    "Last 90 days": 90,
+    "All time": None,
+}
 
 st.title("Drift Monitoring")
 
-path = MONITORING_DIR / "drift_report.html"
 
-if path.exists():
-    st.components.v1.html(path.read_text(), height=900, scrolling=True)
-else:
-    st.write("No drift report available.")
+# ----------------------------
+# Data layer
+# ----------------------------
+@st.cache_resource
+def history() -> dict[str, IncrementalFrame]:
+    # Shared across sessions; only ever grows by the rows newer than its last ts
+    return {
+        "metrics": IncrementalFrame(fetch_monitoring_metrics),
+        "predictions": IncrementalFrame(fetch_prediction_labels),
+    }
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner="Fetching new monitoring data...")
+def sync() -> tuple[str | None, str | None]:
+    h = history()
+    h["metrics"].refresh()
+    h["predictions"].refresh()
+    return h["metrics"].last_ts, h["predictions"].last_ts
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=16, show_spinner=False)
+def aggregates(
+    days: int | None, metrics_ts: str | None, predictions_ts: str | None
+) -> dict[str, Any]:
+    # The *_ts arguments are only part of the cache key: new rows -> new entry
+    h = history()
+    metrics = in_range(h["metrics"].df, days)
+    predictions = in_range(h["predictions"].df, days)
+    return {
+        "latest": None if h["metrics"].df.empty else h["metrics"].df.iloc[-1].to_dict(),
+        "drift_share": drift_share_over_time(metrics),
+        "feature_drift": feature_drift_frequency(metrics),
+        "volume": prediction_volume(predictions),
+        "label_mix": label_mix(predictions),
+    }
+
+
+@st.cache_data(max_entries=2, show_spinner="Loading drift report...")
+def report_html(report_sha256: str) -> str | None:
+    # Reports are content-addressed, so a cached copy never goes stale
+    return load_report_html(report_sha256)
+
+
+def invalidate() -> None:
+    # Full reload: also picks up rows changed anywhere in the history, not just new ones
+    for frame in history().values():
+        frame.reset()
+    sync.clear()
+    aggregates.clear()
+
+
+col_range, col_refresh = st.columns([3, 1])
+with col_range:
+    range_label = st.selectbox("Time range", list(RANGES), index=1)
+with col_refresh:
+    st.write("")
+    if st.button("Refresh now"):
+        invalidate()
+
+try:
+    metrics_ts, predictions_ts = sync()
+except Exception as e:
+    st.error("Could not load monitoring data.")
+    st.exception(e)
+    st.stop()
+
+agg = aggregates(RANGES[range_label], metrics_ts, predictions_ts)
+run = agg["latest"]
+
+if run is None:
+    st.write("No monitoring runs recorded yet.")
+    st.stop()
+
+# ----------------------------
+# 1️⃣ Latest run summary
+# ----------------------------
+st.subheader("Latest run")
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Drift share", f"{run['drift_share']:.3f}", help=f"Threshold: {run['threshold']}")
+col2.metric("Rows in window", run["current_rows"], help=f"Last {run['window_days']} days")
+col3.metric("Model version", run["model_version"])
+
+st.caption(f"Last run: {run['ts']}")
+
+if run["retrain_triggered"]:
+    st.warning("Drift threshold exceeded on the last run. Retraining was triggered.")
+
+drifted = sorted(f for f, flag in (run.get("drifted_features") or {}).items() if flag)
+st.write("Drifted features: " + (", ".join(drifted) if drifted else "none"))
+
+# ----------------------------
+# 2️⃣ History
+# ----------------------------
+st.subheader("Drift share over time")
+st.line_chart(agg["drift_share"])
+
+st.subheader("Feature drift frequency")
+st.caption("Share of monitoring runs in which each feature drifted.")
+st.bar_chart(agg["feature_drift"], horizontal=True)
+
+col4, col5 = st.columns(2)
+with col4:
+    st.subheader("Prediction volume")
+    st.bar_chart(agg["volume"])
+
+with col5:
+    st.subheader("Label mix")
+    st.area_chart(agg["label_mix"])
+
+# ----------------------------
+# 3️⃣ Full report (lazy)
+# ----------------------------
+st.subheader("Full report")
+
+report_sha256 = run.get("report_sha256")
+
+if not report_sha256:
+    st.info("No full report was rendered for the latest run (no drift detected).")
+elif st.toggle("Show full Evidently report"):
+    html = report_html(report_sha256)
+    if html is None:
+        st.write("Report file not found. It may not have been committed yet.")
+    else:
+        st.components.v1.html(html, height=900, scrolling=True)
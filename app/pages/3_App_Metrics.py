@@ -0,0 +1,68 @@
+import pandas as pd
+import streamlit as st
+
+from src.instrumentation import REGISTRY
+
+st.title("App Metrics")
+
+st.caption(
+    "Stage latencies and counters recorded by this app process since it started "
+    "(inference.load, inference.predict_proba, inference_predictions_total, ...)."
+)
+
+if not REGISTRY.enabled:
+    st.info("Instrumentation is off (INSTRUMENTATION=0).")
+    st.stop()
+
+if st.button("Refresh"):
+    st.rerun()
+
+stats = REGISTRY.to_dict()
+
+# ----------------------------
+# 1️⃣ Stage latencies
+# ----------------------------
+st.subheader("Stage latencies")
+
+if not stats["stages"]:
+    st.write("No predictions served yet.")
+else:
+    df_stages = pd.DataFrame.from_dict(stats["stages"], orient="index")
+    df_stages = df_stages.drop(columns="buckets")
+    for col in ("sum_seconds", "max_seconds", "p50_seconds", "p95_seconds"):
+        df_stages[col.replace("_seconds", "_ms")] = df_stages.pop(col) * 1000
+    st.dataframe(df_stages.style.format(precision=1))
+
+# ----------------------------
+# 2️⃣ Counters
+# ----------------------------
+st.subheader("Counters")
+
+if stats["counters"]:
+    st.dataframe(pd.Series(stats["counters"], name="value").to_frame())
+else:
+    st.write("No counters recorded yet.")
+
+# ----------------------------
+# 3️⃣ Export
+# ----------------------------
+st.subheader("Export")
+
+col1, col2 = st.columns(2)
+with col1:
+    st.download_button(
+        "Download Prometheus text",
+        REGISTRY.to_prometheus(),
+        file_name="metrics.prom",
+        mime="text/plain",
+    )
+with col2:
+    st.download_button(
+        "Download JSON",
+        REGISTRY.to_json(),
+        file_name="metrics.json",
+        mime="application/json",
+    )
+
+with st.expander("Prometheus exposition"):
+    st.code(REGISTRY.to_prometheus(), language="text")
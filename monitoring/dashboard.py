@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from typing import Any
+
+import pandas as pd
+
+from src.config import FEATURES
+
+
+# -----------------------------
+# 1) Incremental history
+# -----------------------------
+class IncrementalFrame:
+    """
+    Local copy of a Supabase table ordered by `ts`.
+
+    Each refresh only asks for rows at or after the newest cached `ts`.
+    Rows fetched again (same `id`) replace the cached copy, so a boundary
+    row updated since the last refresh (e.g. report_sha256 attached after
+    the insert) is picked up.
+    """
+
+    def __init__(self, fetch: Callable[[str | None], list[dict[str, Any]]]):
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self.df = pd.DataFrame()
+
+    @property
+    def last_ts(self) -> str | None:
+        if self.df.empty:
+            return None
+        return str(self.df["ts"].iloc[-1].isoformat())
+
+    def refresh(self) -> pd.DataFrame:
+        with self._lock:
+            rows = self._fetch(self.last_ts)
+            if rows:
+                new = pd.DataFrame(rows)
+                new["ts"] = pd.to_datetime(new["ts"], utc=True, format="ISO8601")
+                kept = self.df[~self.df["id"].isin(new["id"])] if not self.df.empty else self.df
+                self.df = pd.concat([kept, new], ignore_index=True).sort_values(
+                    ["ts", "id"], ignore_index=True
+                )
+            return self.df
+
+    def reset(self) -> None:
+        with self._lock:
+            self.df = pd.DataFrame()
+
+
+# -----------------------------
+# 2) Aggregates
+# -----------------------------
+def in_range(df: pd.DataFrame, days: int | None) -> pd.DataFrame:
+    """
+    Rows from the last `days` days (all rows when `days` is None).
+    """
+    if df.empty or days is None:
+        return df
+    cutoff = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=days)
+    return df[df["ts"] >= cutoff]
+
+
+def drift_share_over_time(metrics: pd.DataFrame) -> pd.DataFrame:
+    if metrics.empty:
+        return pd.DataFrame(columns=["drift_share", "threshold"])
+    return metrics.set_index("ts")[["drift_share", "threshold"]]
+
+
+def feature_drift_frequency(metrics: pd.DataFrame) -> pd.Series:
+    """
+    Fraction of runs in which each feature was flagged as drifted.
+    """
+    if metrics.empty:
+        return pd.Series(0.0, index=FEATURES, name="drift_frequency")
+    flags = pd.DataFrame(metrics["drifted_features"].tolist()).reindex(columns=FEATURES)
+    freq = flags.eq(True).mean()
+    return freq.sort_values(ascending=False).rename("drift_frequency")
+
+
+def prediction_volume(predictions: pd.DataFrame, freq: str = "D") -> pd.Series:
+    if predictions.empty:
+        return pd.Series(dtype="int64", name="predictions")
+    return predictions.resample(freq, on="ts").size().rename("predictions")
+
+
+def label_mix(predictions: pd.DataFrame, freq: str = "D") -> pd.DataFrame:
+    """
+    Share of each predicted label per period (rows sum to 1).
+    """
+    if predictions.empty:
+        return pd.DataFrame()
+    counts = (
+        predictions.groupby([pd.Grouper(key="ts", freq=freq), "predicted_label"])
+        .size()
+        .unstack(fill_value=0)
+        .rename_axis(columns=None)
+    )
+    return counts.div(counts.sum(axis=1), axis=0)
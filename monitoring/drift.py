@@ -9,8 +9,15 @@ from evidently.report import Report
 from src.config import FEATURES, REFERENCE_PATH
 
 
-def compute_drift(current_df: pd.DataFrame) -> tuple[float, dict[str, bool], Report]:
-    reference_df = pd.read_csv(REFERENCE_PATH)[FEATURES]
+def load_reference() -> pd.DataFrame:
+    return pd.read_csv(REFERENCE_PATH)[FEATURES]
+
+
+def compute_drift(
+    current_df: pd.DataFrame, reference_df: pd.DataFrame | None = None
+) -> tuple[float, dict[str, bool], Report]:
+    if reference_df is None:
+        reference_df = load_reference()
     current_df = current_df[FEATURES]
 
     report = Report(metrics=[DataDriftPreset()])
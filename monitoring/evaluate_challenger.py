@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import balanced_accuracy_score
+
+from src.inference import load_champion, make_input_frame, predict_proba_batch, validate_input
+from src.model_store import get_challenger_version, load_artifacts, promote
+from src.supabase import fetch_recent_predictions
+from src.train import load_dataset, split_data
+
+LATENCY_SAMPLE_ROWS = 50
+
+
+def replay(model, X: pd.DataFrame) -> dict[str, Any]:
+    """
+    Scores all rows in one batch, plus a per-row sample for single-request latency.
+    """
+    start = time.perf_counter()
+    labels, proba = predict_proba_batch(model, X)
+    batch_seconds = time.perf_counter() - start
+
+    single_ms = []
+    for i in range(min(LATENCY_SAMPLE_ROWS, len(X))):
+        start = time.perf_counter()
+        model.predict_proba(X.iloc[[i]])
+        single_ms.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "labels": labels,
+        "proba": proba,
+        "batch_ms_per_row": batch_seconds * 1000 / max(len(X), 1),
+        "single_row_ms_p50": float(np.median(single_ms)) if single_ms else float("nan"),
+    }
+
+
+def compare(
+    champion,
+    challenger,
+    X: pd.DataFrame,
+    X_holdout: pd.DataFrame,
+    y_holdout: pd.Series,
+) -> dict[str, Any]:
+    """
+    Side-by-side evaluation:
+    - agreement on replayed traffic X (no labels needed)
+    - balanced accuracy on the labelled holdout
+    - latency for both models
+    """
+    a = replay(champion, X)
+    b = replay(challenger, X)
+
+    agree = a["labels"] == b["labels"]
+    agreement_by_label = {
+        str(label): float(agree[a["labels"] == label].mean())
+        for label in np.unique(a["labels"])
+    }
+
+    ba_champion = balanced_accuracy_score(y_holdout, predict_proba_batch(champion, X_holdout)[0])
+    ba_challenger = balanced_accuracy_score(y_holdout, predict_proba_batch(challenger, X_holdout)[0])
+
+    return {
+        "rows": len(X),
+        "agreement": float(agree.mean()),
+        "agreement_by_label": agreement_by_label,
+        "balanced_accuracy": {"champion": float(ba_champion), "challenger": float(ba_challenger)},
+        "batch_ms_per_row": {
+            "champion": a["batch_ms_per_row"],
+            "challenger": b["batch_ms_per_row"],
+        },
+        "single_row_ms_p50": {
+            "champion": a["single_row_ms_p50"],
+            "challenger": b["single_row_ms_p50"],
+        },
+    }
+
+
+def cv_score(meta: dict[str, Any]) -> tuple[float, float] | None:
+    """
+    (mean, std) cross-validated balanced accuracy from model_meta.json, if recorded.
+    """
+    cv = meta.get("cv") or {}
+    mean, std = cv.get("balanced_accuracy_mean"), cv.get("balanced_accuracy_std")
+    if mean is None or std is None:
+        return None
+    return float(mean), float(std)
+
+
+def should_promote(result: dict[str, Any]) -> bool:
+    """
+    "Not worse", judged on the cross-validated scores when both versions have them:
+    - challenger CV mean below the champion's: keep the champion
+    - ahead by more than the fold std: promote
+    - ahead by less (inconclusive): promote only if the holdout score does not regress
+    Without CV scores for both, the holdout score alone decides.
+    """
+    ba = result["balanced_accuracy"]
+    holdout_ok = bool(ba["challenger"] >= ba["champion"])
+
+    cv = result.get("cv_balanced_accuracy") or {}
+    champion, challenger = cv.get("champion"), cv.get("challenger")
+    if champion is None or challenger is None:
+        return holdout_ok
+
+    gap = challenger[0] - champion[0]
+    if gap < 0:
+        return False
+    if gap > max(champion[1], challenger[1]):
+        return True
+    return holdout_ok
+
+
+def _fmt_cv(score: tuple[float, float] | None) -> str:
+    return "n/a" if score is None else f"{score[0]:.4f} ± {score[1]:.4f}"
+
+
+def main(window_days: int = 7) -> None:
+    summary_file = os.getenv("GITHUB_STEP_SUMMARY")
+    promote_requested = "--promote" in sys.argv[1:]
+
+    challenger_version = get_challenger_version()
+    if challenger_version is None:
+        print("No challenger set.")
+        return
+
+    champion, champion_meta = load_champion()
+    champion_version = str(champion_meta.get("model_version", "unknown"))
+    challenger, challenger_meta = load_artifacts(challenger_version)
+
+    _, X_holdout, _, y_holdout = split_data(load_dataset())
+
+    rows = fetch_recent_predictions(window_days=window_days)
+    checked = validate_input(champion_version, make_input_frame(rows))
+    X = checked.frame[checked.valid]
+    if len(X) < len(rows):
+        print(f"Skipped {len(rows) - len(X)} logged rows that fail the input schema.")
+
+    if X.empty:
+        print("No usable recent predictions, replaying the holdout set instead.")
+        X = X_holdout
+
+    result = compare(champion, challenger, X, X_holdout, y_holdout)
+    result["cv_balanced_accuracy"] = {
+        "champion": cv_score(champion_meta),
+        "challenger": cv_score(challenger_meta),
+    }
+    recommended = should_promote(result)
+
+    ba = result["balanced_accuracy"]
+    cv = result["cv_balanced_accuracy"]
+    batch = result["batch_ms_per_row"]
+    single = result["single_row_ms_p50"]
+
+    print(f"Champion {champion_version} vs challenger {challenger_version}")
+    print(f"Replayed rows: {result['rows']}, agreement: {result['agreement']:.3f}")
+    print(f"Balanced accuracy: {ba['champion']:.4f} vs {ba['challenger']:.4f}")
+    print(f"CV balanced accuracy: {_fmt_cv(cv['champion'])} vs {_fmt_cv(cv['challenger'])}")
+    print(f"Single-row p50 (ms): {single['champion']:.2f} vs {single['challenger']:.2f}")
+    print("Promotion recommended." if recommended else "Challenger not better, keep champion.")
+
+    if summary_file:
+        with open(summary_file, "a") as f:
+            f.write("## Champion vs Challenger\n")
+            f.write(f"- Champion: {champion_version}\n")
+            f.write(f"- Challenger: {challenger_version}\n")
+            f.write(f"- Replayed rows: {result['rows']}\n")
+            f.write(f"- Agreement: {result['agreement']:.3f}\n\n")
+            f.write("| | Champion | Challenger |\n|---|---|---|\n")
+            f.write(f"| Balanced accuracy | {ba['champion']:.4f} | {ba['challenger']:.4f} |\n")
+            f.write(f"| CV balanced accuracy | {_fmt_cv(cv['champion'])} | {_fmt_cv(cv['challenger'])} |\n")
+            f.write(f"| Batch ms/row | {batch['champion']:.3f} | {batch['challenger']:.3f} |\n")
+            f.write(f"| Single-row p50 ms | {single['champion']:.2f} | {single['challenger']:.2f} |\n")
+
+    if promote_requested:
+        if recommended:
+            promote(challenger_version)
+            print(f"Promoted {challenger_version} to champion.")
+        else:
+            print("::warning::Promotion requested but challenger is not better. Skipped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from datetime import datetime, timezone
 
 
@@ -9,8 +11,11 @@ def make_metrics_row(
     drift_flags: dict,
     threshold: float,
     retrain_triggered: bool,
+    report_sha256: str | None = None,
+    run_id: str | None = None,
 ) -> dict:
     return {
+        "run_id": run_id,
         "ts": datetime.now(timezone.utc).isoformat(),
         "model_version": model_version,
         "window_days": int(window_days),
@@ -19,4 +24,5 @@ def make_metrics_row(
         "drifted_features": drift_flags,
         "threshold": float(threshold),
         "retrain_triggered": bool(retrain_triggered),
+        "report_sha256": report_sha256,
     }
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+from pathlib import Path
+from typing import Any
+
+from src.config import REPORTS_DIR
+
+
+def report_requested() -> bool:
+    """
+    A full HTML report can be forced with DRIFT_REPORT=1 (e.g. from workflow_dispatch).
+    """
+    return os.getenv("DRIFT_REPORT", "").strip().lower() in {"1", "true", "yes", "always"}
+
+
+def should_render_report(drift_detected: bool) -> bool:
+    return drift_detected or report_requested()
+
+
+def report_path(report_sha256: str) -> Path:
+    return REPORTS_DIR / f"{report_sha256}.html.gz"
+
+
+def save_report(report: Any) -> str:
+    """
+    Renders an Evidently report and stores it gzipped under its content hash.
+    Returns the sha256 of the HTML, which is logged alongside the run's metrics.
+    """
+    html = report.get_html().encode("utf-8")
+    report_sha256 = hashlib.sha256(html).hexdigest()
+
+    path = report_path(report_sha256)
+    if not path.exists():
+        REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        # mtime=0 keeps the compressed bytes deterministic for identical reports
+        tmp.write_bytes(gzip.compress(html, compresslevel=9, mtime=0))
+        tmp.replace(path)
+
+    return report_sha256
+
+
+def load_report_html(report_sha256: str) -> str | None:
+    path = report_path(report_sha256)
+    if not path.exists():
+        return None
+    return gzip.decompress(path.read_bytes()).decode("utf-8")
@@ -1,76 +1,206 @@
-import json
 import os
+import sys
+import uuid
+from datetime import datetime, timezone
+from typing import Any
 
 import pandas as pd
 
-from monitoring.drift import compute_drift
+from monitoring.drift import compute_drift, load_reference
 from monitoring.log_metrics import make_metrics_row
-from src.config import MODEL_META_PATH, MONITORING_DIR
-from src.supabase import fetch_recent_predictions, insert_monitoring_metrics
+from monitoring.reports import save_report, should_render_report
+from monitoring.runner import Checkpoints, SkipStage, Stage, StageResult, run_dag, run_in_process
+from src.config import CHECKPOINT_DIR, MONITORING_DIR
+from src.instrumentation import REGISTRY, profile
+from src.model_store import get_champion_version, list_versions, set_challenger
+from src.supabase import (
+    fetch_recent_predictions,
+    insert_monitoring_metrics,
+    update_monitoring_metrics,
+)
 from src.train import main as retrain
 
+WINDOW_DAYS = 7
+MIN_ROWS_REQUIRED = 200
+RETRAIN_TIMEOUT_SECONDS = 900
+
+# A failure in any of these means the run produced no usable metrics row
+CRITICAL_STAGES = ("fetch", "drift", "insert_metrics")
+
+
+def get_run_id() -> tuple[str, bool]:
+    """
+    Returns (run_id, resumable). Re-running a GitHub workflow run (or reusing
+    MONITORING_RUN_ID) resumes from the checkpoints of the previous attempt;
+    any other invocation is a fresh run with its own id.
+    """
+    explicit = os.getenv("MONITORING_RUN_ID") or os.getenv("GITHUB_RUN_ID")
+    if explicit:
+        return explicit, True
+    return datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S-") + uuid.uuid4().hex[:8], False
+
+
+def retrain_challenger() -> str:
+    # Runs in a separate process, see run_in_process
+    return retrain(promote=False, fast=True)
+
+
+# -----------------------------
+# 1) Stages
+# -----------------------------
+def build_stages(run_id: str, threshold: float, model_version: str) -> list[Stage]:
+    def reference(_: dict[str, Any]) -> dict[str, Any]:
+        return {"_df": load_reference()}
+
+    def fetch(_: dict[str, Any]) -> dict[str, Any]:
+        # In memory only: the rows hold customer features, which must not end up
+        # in checkpoint files (or the Actions cache). A resumed run refetches them.
+        return {"_rows": fetch_recent_predictions(window_days=WINDOW_DAYS)}
+
+    def drift(deps: dict[str, Any]) -> dict[str, Any]:
+        rows = deps["fetch"]["_rows"]
+        if not rows:
+            raise SkipStage("No recent data.")
+
+        current_df = pd.DataFrame(rows)
+        drift_share, drift_flags, report = compute_drift(current_df, deps["reference"]["_df"])
+        print("Drift share:", drift_share)
+
+        current_rows = len(current_df)
+        if current_rows < MIN_ROWS_REQUIRED:
+            print("::warning::Insufficient prediction data for reliable drift detection.")
+
+        return {
+            "drift_share": drift_share,
+            "drift_flags": drift_flags,
+            "current_rows": current_rows,
+            "drift_detected": drift_share >= threshold,
+            "retrain_triggered": current_rows >= MIN_ROWS_REQUIRED and drift_share >= threshold,
+            "_report": report,
+        }
+
+    def insert_metrics(deps: dict[str, Any]) -> dict[str, Any]:
+        d = deps["drift"]
+        insert_monitoring_metrics(
+            make_metrics_row(
+                model_version=model_version,
+                window_days=WINDOW_DAYS,
+                current_rows=d["current_rows"],
+                drift_share=d["drift_share"],
+                drift_flags=d["drift_flags"],
+                threshold=threshold,
+                retrain_triggered=d["drift_detected"],
+                run_id=run_id,
+            )
+        )
+        return {"run_id": run_id}
 
-def main():
-    summary_file = os.getenv("GITHUB_STEP_SUMMARY")
-
-    threshold = float((MONITORING_DIR / "drift_threshold.txt").read_text())
-
-    window_days = 7
-    model_version = json.loads((MODEL_META_PATH).read_text())["model_version"]
+    def report(deps: dict[str, Any]) -> dict[str, Any]:
+        d = deps["drift"]
+        if not should_render_report(d["drift_detected"]):
+            raise SkipStage("No drift detected.")
 
-    rows = fetch_recent_predictions(window_days=window_days)
+        evidently_report = d.get("_report")
+        if evidently_report is None:
+            # drift was restored from a checkpoint, so rebuild the Evidently report
+            _, _, evidently_report = compute_drift(
+                pd.DataFrame(deps["fetch"]["_rows"]), deps["reference"]["_df"]
+            )
 
-    if not rows:
-        print("No recent data.")
-        return
+        report_sha256 = save_report(evidently_report)
+        print("Drift report saved:", report_sha256)
+        return {"report_sha256": report_sha256}
 
-    current_df = pd.DataFrame(rows)
+    def attach_report(deps: dict[str, Any]) -> None:
+        update_monitoring_metrics(run_id, {"report_sha256": deps["report"]["report_sha256"]})
 
-    drift_share, drift_flags, report = compute_drift(current_df)
+    def retrain_stage(deps: dict[str, Any]) -> dict[str, Any]:
+        if not deps["drift"]["retrain_triggered"]:
+            raise SkipStage("No retraining needed.")
 
-    print("Drift share:", drift_share)
+        print("::warning::Drift threshold exceeded. Automatic retraining trigerred. New training data may be needed.")
+        version = run_in_process(retrain_challenger, timeout=RETRAIN_TIMEOUT_SECONDS)
+        # The new model is scored in shadow until monitoring.evaluate_challenger promotes it
+        set_challenger(version)
+        print("New challenger model:", version)
+        return {"challenger_version": version}
+
+    return [
+        Stage("reference", reference, checkpoint=False),
+        Stage("fetch", fetch, checkpoint=False),
+        Stage("drift", drift, deps=("fetch", "reference")),
+        Stage("insert_metrics", insert_metrics, deps=("drift",)),
+        Stage("report", report, deps=("drift", "fetch", "reference")),
+        Stage("attach_report", attach_report, deps=("report", "insert_metrics")),
+        Stage("retrain", retrain_stage, deps=("drift",)),
+    ]
+
+
+# -----------------------------
+# 2) Reporting
+# -----------------------------
+def write_summary(summary_file: str, results: dict[str, StageResult], threshold: float) -> None:
+    drift = results["drift"]
+    report = results["report"]
+
+    with open(summary_file, "a") as f:
+        if drift.status in {"done", "cached"}:
+            d = drift.value
+            f.write("## Drift Report\n")
+            f.write(f"- Number of rows: {d['current_rows']}\n")
+            f.write(f"- Rows required for robust drift calculation: {MIN_ROWS_REQUIRED}\n")
+            f.write(f"- Drift share: {d['drift_share']:.3f}\n")
+            f.write(f"- Drift threshold: {threshold}\n")
+            if report.status in {"done", "cached"}:
+                sha = report.value["report_sha256"]
+                f.write(f"- Full report: monitoring/reports/{sha}.html.gz\n")
+            if d["retrain_triggered"]:
+                f.write("*Action required:* Significant feature drift detected, update training data and retrain model\n")
+
+        f.write("\n## Stages\n")
+        f.write("| Stage | Status | Seconds | Note |\n|---|---|---|---|\n")
+        for r in results.values():
+            f.write(f"| {r.name} | {r.status} | {r.seconds:.2f} | {r.note} |\n")
 
-    report_path = MONITORING_DIR / "drift_report.html"
-    report.save_html(str(report_path))
 
-    min_rows_required = 200
-    current_rows = len(current_df)
+def main():
+    summary_file = os.getenv("GITHUB_STEP_SUMMARY")
 
-    if current_rows < min_rows_required:
-        print("::warning::Insufficient prediction data for reliable drift detection.")
-        retrain_triggered = False
-    else:
-        retrain_triggered = drift_share >= threshold
+    threshold = float((MONITORING_DIR / "drift_threshold.txt").read_text())
+    model_version = get_champion_version() or "unknown"
+    run_id, resumable = get_run_id()
 
-    if retrain_triggered:
-        print("::warning::Drift threshold exceeded. Automatic retraining trigerred. New training data may be needed.")
-        retrain()
-    else:
-        print("No retraining needed.")
-
-    try:
-        metrics_row = make_metrics_row(
-            model_version=model_version,
-            window_days=window_days,
-            current_rows=current_rows,
-            drift_share=drift_share,
-            drift_flags=drift_flags,
-            threshold=threshold,
-            retrain_triggered=(drift_share >= threshold),
+    with profile("retrain_if_needed"):
+        results = run_dag(
+            build_stages(run_id, threshold, model_version),
+            checkpoints=Checkpoints(CHECKPOINT_DIR, run_id) if resumable else None,
         )
-        insert_monitoring_metrics(metrics_row)
-
-        if summary_file:
-            with open(summary_file, "a") as f:
-                f.write("## Drift Report\n")
-                f.write(f"- Number of rows: {current_rows}\n")
-                f.write(f"- Rows required for robust drift calculation: {min_rows_required}\n")
-                f.write(f"- Drift share: {drift_share:.3f}\n")
-                f.write(f"- Drift threshold: {threshold}\n")
-                if retrain_triggered:
-                    f.write("*Action required:* Significant feature drift detected, update training data and retrain model")
-    except Exception:
-        pass
+
+    for r in results.values():
+        if r.status == "failed":
+            level = "error" if r.name in CRITICAL_STAGES else "warning"
+            print(f"::{level}::Stage {r.name} failed: {r.note}")
+        elif r.status == "skipped" and r.note:
+            print(f"{r.name}: {r.note}")
+
+    retrain_result = results["retrain"]
+    if retrain_result.status == "cached":
+        # The model itself comes from the Actions cache, not the checkpoint
+        version = retrain_result.value["challenger_version"]
+        if version not in list_versions():
+            print(f"::warning::Restored retrain checkpoint, but challenger {version} is missing.")
+
+    metrics_out = os.getenv("METRICS_OUT")
+    if metrics_out:
+        REGISTRY.write(metrics_out)
+
+    if summary_file:
+        write_summary(summary_file, results, threshold)
+        with open(summary_file, "a") as f:
+            f.write("\n" + REGISTRY.to_markdown())
+
+    if any(results[name].status == "failed" for name in CRITICAL_STAGES):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import signal
+import time
+import traceback
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from queue import Empty
+from typing import Any
+
+from src.instrumentation import stage as timed_stage
+
+
+class SkipStage(Exception):
+    """
+    Raised by a stage that has nothing to do. Its dependents are skipped too.
+    """
+
+
+@dataclass
+class Stage:
+    """
+    One node of the job DAG.
+
+    fn receives {dependency name: dependency value}. Dict keys starting with
+    "_" are kept in memory for dependents but never written to checkpoints,
+    so a stage restored from a checkpoint will not have them.
+    """
+
+    name: str
+    fn: Callable[[dict[str, Any]], Any]
+    deps: tuple[str, ...] = ()
+    checkpoint: bool = True
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str  # done | cached | skipped | failed
+    seconds: float = 0.0
+    value: Any = None
+    note: str = ""
+
+
+# -----------------------------
+# 1) Checkpoints
+# -----------------------------
+@dataclass
+class Checkpoints:
+    """
+    One JSON file per successful stage under <root>/<run_id>/. Failed and
+    skipped stages are not recorded, so a rerun with the same run_id runs
+    them again (a skip may depend on settings or data that changed).
+    """
+
+    root: Path
+    run_id: str
+    _dir: Path = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._dir = self.root / self.run_id
+
+    def load(self, name: str) -> StageResult | None:
+        path = self._dir / f"{name}.json"
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return StageResult(
+            name=name,
+            status="cached" if data["status"] == "done" else data["status"],
+            seconds=data["seconds"],
+            value=data["value"],
+            note=data.get("note", ""),
+        )
+
+    def save(self, result: StageResult) -> None:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        value = result.value
+        if isinstance(value, dict):
+            value = {k: v for k, v in value.items() if not k.startswith("_")}
+
+        path = self._dir / f"{result.name}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "status": result.status,
+                    "seconds": result.seconds,
+                    "value": value,
+                    "note": result.note,
+                },
+                default=str,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+
+
+# -----------------------------
+# 2) DAG Runner
+# -----------------------------
+def run_dag(
+    stages: list[Stage],
+    checkpoints: Checkpoints | None = None,
+    max_workers: int = 4,
+) -> dict[str, StageResult]:
+    """
+    Runs every stage as soon as its dependencies are done, on a thread pool.
+    A failed or skipped stage skips its dependents; other branches carry on.
+    """
+    by_name = {s.name: s for s in stages}
+    for s in stages:
+        unknown = [d for d in s.deps if d not in by_name]
+        if unknown:
+            raise ValueError(f"Stage {s.name} depends on unknown stage(s): {unknown}")
+
+    results: dict[str, StageResult] = {}
+    running: dict[Future, str] = {}
+
+    def ready(s: Stage) -> bool:
+        return (
+            s.name not in results
+            and s.name not in running.values()
+            and all(d in results for d in s.deps)
+        )
+
+    def execute(s: Stage, inputs: dict[str, Any]) -> StageResult:
+        start = time.perf_counter()
+        skip: SkipStage | None = None
+        try:
+            with timed_stage(f"monitoring.{s.name}"):
+                # caught inside the timed block, so a skip is not counted as a stage error
+                try:
+                    value = s.fn(inputs)
+                except SkipStage as e:
+                    skip = e
+            if skip is not None:
+                return StageResult(s.name, "skipped", time.perf_counter() - start, note=str(skip))
+            return StageResult(s.name, "done", time.perf_counter() - start, value)
+        except Exception as e:
+            traceback.print_exc()
+            return StageResult(s.name, "failed", time.perf_counter() - start, note=f"{type(e).__name__}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="monitoring") as pool:
+        while len(results) < len(stages):
+            runnable = [s for s in stages if ready(s)]
+            if not runnable and not running:
+                raise ValueError("Stage graph has a cycle.")
+
+            for s in runnable:
+                upstream = [results[d] for d in s.deps]
+                blocked = [r for r in upstream if r.status not in {"done", "cached"}]
+                if blocked:
+                    results[s.name] = StageResult(s.name, "skipped", note=f"{blocked[0].name} {blocked[0].status}")
+                    continue
+
+                cached = checkpoints.load(s.name) if checkpoints and s.checkpoint else None
+                if cached is not None:
+                    results[s.name] = cached
+                    continue
+
+                running[pool.submit(execute, s, {d: results[d].value for d in s.deps})] = s.name
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                result = fut.result()
+                results[name] = result
+                if checkpoints and by_name[name].checkpoint and result.status == "done":
+                    checkpoints.save(result)
+
+    return results
+
+
+# -----------------------------
+# 3) Process isolation
+# -----------------------------
+def _child(fn: Callable[..., Any], args: tuple, queue) -> None:
+    if hasattr(os, "setpgrp"):
+        # Own process group, so a timeout also kills processes fn starts (e.g. the CV pool)
+        os.setpgrp()
+    try:
+        queue.put(("ok", fn(*args)))
+    except BaseException as e:
+        queue.put(("error", f"{type(e).__name__}: {e}"))
+
+
+def _kill_group(proc) -> None:
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+            return
+        except ProcessLookupError:
+            pass  # already gone, or exited before it could create its group
+    if proc.is_alive():
+        proc.terminate()
+
+
+def run_in_process(fn: Callable[..., Any], args: tuple = (), timeout: float | None = None) -> Any:
+    """
+    Runs fn(*args) in a fresh (spawned) process and returns its result.
+    The process and everything it started are killed if it runs past
+    `timeout` seconds.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(fn, args, queue))
+    proc.start()
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                status, value = queue.get(timeout=1.0)
+                break
+            except Empty:
+                if not proc.is_alive():
+                    raise RuntimeError(f"Child process exited with code {proc.exitcode}") from None
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f"{fn.__name__} did not finish within {timeout}s") from None
+    finally:
+        # Before join(), so the group id cannot have been reused yet
+        _kill_group(proc)
+        proc.join()
+
+    if status == "error":
+        raise RuntimeError(value)
+    return value
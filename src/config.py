@@ -5,11 +5,15 @@ ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = ROOT / "data"
 MODEL_DIR = ROOT / "models"
 MONITORING_DIR = ROOT / "monitoring"
+PROFILE_DIR = ROOT / "profiles"
 
 DATASET_PATH = DATA_DIR / "InsureABC_Channel_Data.csv"
 REFERENCE_PATH = DATA_DIR / "InsureABC_Channel_Data_Ref.csv"
-MODEL_PATH = MODEL_DIR / "model.joblib"
-MODEL_META_PATH = MODEL_DIR / "model_meta.json"
+VERSIONS_DIR = MODEL_DIR / "versions"
+CHAMPION_PATH = MODEL_DIR / "champion.json"
+CHALLENGER_PATH = MODEL_DIR / "challenger.json"
+REPORTS_DIR = MONITORING_DIR / "reports"
+CHECKPOINT_DIR = MONITORING_DIR / "checkpoints"
 
 FEATURES = [
     "CreditCardType",
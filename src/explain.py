@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+
+from src.config import FEATURES
+
+# Path-based (Saabas-style) attributions for the fitted GradientBoostingClassifier.
+#
+# Every tree node gets the cover-weighted mean of the leaf values below it.
+# Stepping from a node to a child changes that expectation; the change is
+# credited to the input feature the node splits on (one-hot columns count as
+# their original feature). Summed along a row's path through every tree this
+# gives per-feature contributions to each class's raw score (log-odds), and
+# bias + contributions == decision_function, exactly.
+
+
+# -----------------------------
+# 1) Precomputed Tables
+# -----------------------------
+@dataclass
+class PathExplainer:
+    """
+    All trees padded to max_nodes and stacked as (n_stages, n_classes, max_nodes):
+    - feature / threshold / left / right: the tree structure (leaves point to themselves)
+    - tables: (..., n_features) contributions of the path ending at each node,
+      already scaled by the learning rate
+    - bias: (n_classes,) raw score shared by every row
+    """
+
+    features: list[str]
+    classes: list[str]
+    depth: int
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    tables: np.ndarray
+    bias: np.ndarray
+
+
+def output_groups(pipeline: Pipeline) -> np.ndarray:
+    """
+    For each ColumnTransformer output column, the index in FEATURES of the
+    input column it came from.
+    """
+    preprocessor = pipeline.named_steps["preprocessor"]
+    groups = np.full(max(s.stop for s in preprocessor.output_indices_.values()), -1)
+
+    for name, transformer, cols in preprocessor.transformers_:
+        if name == "remainder":
+            continue
+
+        # One-hot encoders emit one column per category, everything else one per input
+        encoder = transformer.steps[-1][1] if isinstance(transformer, Pipeline) else transformer
+        onehot = hasattr(encoder, "categories_") and hasattr(encoder, "drop_idx_")
+        widths = [len(c) for c in encoder.categories_] if onehot else [1] * len(cols)
+
+        start = preprocessor.output_indices_[name].start
+        for col, width in zip(cols, widths, strict=True):
+            groups[start : start + width] = FEATURES.index(col)
+            start += width
+
+    return groups
+
+
+def _path_table(tree, groups: np.ndarray) -> np.ndarray:
+    left, right = tree.children_left, tree.children_right
+    cover = tree.weighted_n_node_samples
+
+    # Expected value per node, bottom-up (children always have larger ids)
+    expected = tree.value[:, 0, 0].copy()
+    for node in range(tree.node_count - 1, -1, -1):
+        lo, hi = left[node], right[node]
+        if lo != -1:
+            expected[node] = (cover[lo] * expected[lo] + cover[hi] * expected[hi]) / (
+                cover[lo] + cover[hi]
+            )
+
+    table = np.zeros((tree.node_count, len(FEATURES)))
+    for node in range(tree.node_count):
+        if left[node] == -1:
+            continue
+        g = groups[tree.feature[node]]
+        for child in (left[node], right[node]):
+            table[child] = table[node]
+            table[child, g] += expected[child] - expected[node]
+
+    return table
+
+
+def build_explainer(pipeline: Pipeline, X_sample: pd.DataFrame) -> PathExplainer:
+    """
+    Precomputes the path tables (done once, at training time). One valid row
+    of X_sample pins down the bias, which includes the classifier's prior.
+    """
+    clf = pipeline.named_steps["classifier"]
+    groups = output_groups(pipeline)
+    n_stages, n_classes = clf.estimators_.shape
+    trees = [[est.tree_ for est in row] for row in clf.estimators_]
+
+    shape = (n_stages, n_classes, max(t.node_count for row in trees for t in row))
+    feature = np.zeros(shape, dtype=np.intp)
+    threshold = np.zeros(shape)
+    left = np.zeros(shape, dtype=np.intp)
+    right = np.zeros(shape, dtype=np.intp)
+    tables = np.zeros((*shape, len(FEATURES)))
+
+    for s in range(n_stages):
+        for k in range(n_classes):
+            t = trees[s][k]
+            n = t.node_count
+            nodes = np.arange(n)
+            leaf = t.children_left == -1
+            feature[s, k, :n] = np.where(leaf, 0, t.feature)
+            threshold[s, k, :n] = t.threshold
+            left[s, k, :n] = np.where(leaf, nodes, t.children_left)
+            right[s, k, :n] = np.where(leaf, nodes, t.children_right)
+            tables[s, k, :n] = _path_table(t, groups) * clf.learning_rate
+
+    explainer = PathExplainer(
+        features=list(FEATURES),
+        classes=[str(c) for c in clf.classes_],
+        depth=max(t.max_depth for row in trees for t in row),
+        feature=feature,
+        threshold=threshold,
+        left=left,
+        right=right,
+        tables=tables,
+        bias=np.zeros(n_classes),
+    )
+
+    x0 = X_sample.iloc[:1]
+    raw = np.asarray(pipeline.decision_function(x0)).reshape(n_classes)
+    explainer.bias = raw - explain_batch(pipeline, explainer, x0)[0].sum(axis=1)
+    return explainer
+
+
+# -----------------------------
+# 2) Explanations
+# -----------------------------
+def leaf_nodes(explainer: PathExplainer, Xt) -> np.ndarray:
+    """
+    Leaf reached by every row in every tree, shape (n_rows, n_stages, n_classes).
+    Walks all trees at once, one level per step.
+    """
+    if hasattr(Xt, "toarray"):  # sparse one-hot output
+        Xt = Xt.toarray()
+    # Trees compare float32 features against float64 thresholds
+    Xt = np.asarray(Xt, dtype=np.float32)
+
+    n_stages, n_classes, _ = explainer.feature.shape
+    s = np.arange(n_stages)[None, :, None]
+    k = np.arange(n_classes)[None, None, :]
+    rows = np.arange(len(Xt))[:, None, None]
+
+    nodes = np.zeros((len(Xt), n_stages, n_classes), dtype=np.intp)
+    for _ in range(explainer.depth):
+        x = Xt[rows, explainer.feature[s, k, nodes]]
+        nodes = np.where(
+            x <= explainer.threshold[s, k, nodes],
+            explainer.left[s, k, nodes],
+            explainer.right[s, k, nodes],
+        )
+    return nodes
+
+
+def explain_transformed(explainer: PathExplainer, Xt) -> np.ndarray:
+    """
+    Contributions for an already preprocessed batch, see explain_batch.
+    """
+    nodes = leaf_nodes(explainer, Xt)
+    n_rows, n_stages, n_classes = nodes.shape
+    k = np.arange(n_classes)
+
+    out = np.zeros((n_rows, n_classes, len(explainer.features)))
+    for s in range(n_stages):
+        out += explainer.tables[s, k, nodes[:, s, :]]
+    return out
+
+
+def explain_batch(pipeline: Pipeline, explainer: PathExplainer, X: pd.DataFrame) -> np.ndarray:
+    """
+    Contributions of shape (n_rows, n_classes, n_features) in raw score units
+    (log-odds), with features in explainer.features order.
+    """
+    Xt = pipeline.named_steps["preprocessor"].transform(X)
+    return explain_transformed(explainer, Xt)
+
+
+def explanation_frame(
+    explainer: PathExplainer, contributions: np.ndarray, class_name: str
+) -> pd.DataFrame:
+    """
+    One row's contributions towards `class_name`, largest effect first.
+    """
+    k = explainer.classes.index(class_name)
+    df = pd.DataFrame({"Contribution": contributions[k]}, index=explainer.features)
+    return df.reindex(df["Contribution"].abs().sort_values(ascending=False).index)
+
+
+# -----------------------------
+# 3) Batch Export
+# -----------------------------
+def main() -> None:
+    """
+    python -m src.explain input.csv output.csv
+
+    Writes the served model's predicted label and the per-feature
+    contributions towards it for every valid row of input.csv.
+    """
+    from src.inference import load_champion, load_explainer, validate_input
+
+    if len(sys.argv) != 3:
+        raise SystemExit("Usage: python -m src.explain input.csv output.csv")
+
+    model, meta = load_champion()
+    version = str(meta["model_version"])
+    explainer = load_explainer(version)
+
+    checked = validate_input(version, pd.read_csv(sys.argv[1]))
+    X = checked.frame[checked.valid]
+
+    # bias + contributions are the raw scores, so no separate predict pass is needed
+    contributions = explain_batch(model, explainer, X)
+    k = np.argmax(explainer.bias + contributions.sum(axis=2), axis=1)
+    own = contributions[np.arange(len(X)), k]
+
+    out = pd.DataFrame(own, columns=explainer.features, index=X.index).add_prefix("contrib_")
+    out.insert(0, "predicted_label", np.asarray(explainer.classes)[k])
+    out.to_csv(sys.argv[2])
+
+    print(f"Explained {len(X)} rows ({int((~checked.valid).sum())} invalid rows skipped).")
+
+
+if __name__ == "__main__":
+    main()
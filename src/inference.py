@@ -1,70 +1,144 @@
 from __future__ import annotations
 
-import json
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, cast
 
-import joblib
 import numpy as np
 import pandas as pd
 
-from src.config import FEATURES, MODEL_META_PATH, MODEL_PATH
+from src.config import DATASET_PATH, FEATURES
+from src.explain import PathExplainer, build_explainer, explain_transformed, explanation_frame
+from src.instrumentation import count, profile, stage
+from src.model_store import (
+    EXPLAINER_FILE,
+    get_challenger_version,
+    get_champion_version,
+    load_artifacts,
+    load_extra,
+    load_version,
+)
+from src.schema import (
+    InputSchema,
+    InvalidInputError,
+    ValidationResult,
+    compile_schema,
+    validate,
+)
 from src.supabase import insert_prediction
 
+# Shadow scoring and logging run here, off the request path
+_background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference-bg")
+
 
 # -----------------------------
 # 1) Load Artifacts
 # -----------------------------
-def load_model():
-    if not MODEL_PATH.exists():
+def load_champion() -> tuple[Any, dict[str, Any]]:
+    """
+    Returns (model, meta) for the served version. Both come from the same
+    version directory, so a concurrent publish can never mix them.
+    """
+    version = get_champion_version()
+    if version is None:
         raise FileNotFoundError("Model not trained yet. Run: python -m src.train")
-    return joblib.load(MODEL_PATH)
+    return load_artifacts(version)
+
+
+def load_model():
+    return load_champion()[0]
 
 
 def load_model_meta() -> dict[str, Any]:
-    if not MODEL_META_PATH.exists():
-        raise FileNotFoundError("model_meta.json not found. Train the model first.")
-    return cast(dict[str, Any], json.loads(MODEL_META_PATH.read_text(encoding="utf-8")))
+    return load_champion()[1]
 
 
 def get_model_version(meta: dict) -> str:
     return str(meta.get("model_version", "unknown"))
 
 
+@lru_cache(maxsize=4)
+def load_schema(model_version: str) -> InputSchema:
+    """
+    Input schema compiled from the version's fitted encoders (once per version).
+    """
+    return compile_schema(load_version(model_version))
+
+
+@lru_cache(maxsize=4)
+def load_explainer(model_version: str) -> PathExplainer:
+    """
+    Path tables saved with the version at training time. Versions trained
+    before explainers were stored get them built here, once.
+    """
+    explainer = load_extra(model_version, EXPLAINER_FILE)
+    if explainer is None:
+        sample = pd.read_csv(DATASET_PATH, usecols=FEATURES, nrows=1)
+        explainer = build_explainer(load_version(model_version), sample)
+    return cast(PathExplainer, explainer)
+
+
+def load_challenger() -> tuple[str, Any] | None:
+    """
+    Returns (model_version, model) for the shadow challenger, if one is set.
+    """
+    version = get_challenger_version()
+    if version is None:
+        return None
+    return version, load_version(version)
+
+
 # -----------------------------
 # 2) Prediction Logic
 # -----------------------------
+def make_input_frame(rows: list[dict[str, Any]]) -> pd.DataFrame:
+    """
+    Builds a raw batch in training column order. Coerce it with validate_input.
+    """
+    return pd.DataFrame.from_records(rows).reindex(columns=FEATURES)
+
+
 def make_input_df(features: dict[str, Any]) -> pd.DataFrame:
     """
-    Ensures input matches training schema.
+    Single request as a one-row batch.
+    """
+    return make_input_frame([{k: features[k] for k in FEATURES}])
+
+
+def validate_input(model_version: str, X: pd.DataFrame) -> ValidationResult:
+    """
+    Checks categories, ranges and missing values against the model's schema.
+    result.frame is the coerced batch; result.valid marks usable rows.
     """
-    df = pd.DataFrame([{k: features[k] for k in FEATURES}])
-    # Force numeric columns to float
-    numeric_cols = [
-        "Age",
-        "MotorValue",
-        "HealthDependentsAdults",
-        "HealthDependentsKids",
-    ]
+    return validate(load_schema(model_version), X)
 
-    for col in numeric_cols:
-        df[col] = df[col].astype(float)
 
-    return df
+def predict_proba_batch(model, X: pd.DataFrame | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Scores a whole batch in one predict_proba call.
+
+    Returns:
+    - predicted labels, shape = (n_rows,)
+    - probabilities, shape = (n_rows, n_classes) in model.classes_ order
+    """
+    proba = model.predict_proba(X)
+    labels = np.asarray(model.classes_)[np.argmax(proba, axis=1)]
+    return labels, proba
 
 
-def predict_proba_and_label(model, X: pd.DataFrame) -> tuple[str, dict[str, float]]:
+def predict_proba_and_label(model, X: pd.DataFrame | np.ndarray) -> tuple[str, dict[str, float]]:
     """
     Returns:
     - predicted label (string)
     - dict of {class_name: probability}
     """
-    proba = model.predict_proba(X)[0]  # shape = (n_classes,)
+    labels, proba = predict_proba_batch(model, X)
     classes = list(model.classes_)  # e.g. ["Email", "Phone", "SMS"]
 
-    proba_map = {cls: float(p) for cls, p in zip(classes, proba, strict=False)}
-    predicted_label = classes[int(np.argmax(proba))]
+    proba_map = {cls: float(p) for cls, p in zip(classes, proba[0], strict=False)}
+    predicted_label = str(labels[0])
 
     return predicted_label, proba_map
 
@@ -98,9 +172,92 @@ def build_prediction_row(
     return row
 
 
+def add_shadow_prediction(row: dict[str, Any], X: pd.DataFrame) -> None:
+    """
+    Scores the challenger (if any) on the same input and records its label.
+    """
+    challenger = load_challenger()
+    if challenger is None:
+        return
+
+    version, model = challenger
+    if version == row["model_version"]:
+        return
+
+    labels, _ = predict_proba_batch(model, X)
+    row["shadow_model_version"] = version
+    row["shadow_predicted_label"] = str(labels[0])
+
+
+def log_prediction(row: dict[str, Any], X: pd.DataFrame) -> None:
+    try:
+        with stage("inference.shadow"):
+            add_shadow_prediction(row, X)
+    except Exception:
+        # a broken challenger must not stop the champion's row being logged
+        count("inference_shadow_failures_total")
+
+    try:
+        with stage("inference.insert_prediction"):
+            insert_prediction(row)
+    except Exception:
+        # never break inference UX if logging fails
+        count("inference_log_failures_total")
+
+
 # -----------------------------
 # 4) Public API
 # -----------------------------
+def _predict(
+    features: dict[str, Any], with_explanation: bool
+) -> tuple[str, dict[str, float], pd.DataFrame | None]:
+    with profile("predict"):
+        with stage("inference.load"):
+            model, meta = load_champion()
+        model_version = get_model_version(meta)
+
+        with stage("inference.validate_input"):
+            result = validate_input(model_version, make_input_df(features))
+
+        if not result.valid[0]:
+            count("inference_invalid_inputs_total")
+            raise InvalidInputError("Invalid input: " + "; ".join(result.messages(0)))
+
+        X = result.frame
+        explanation = None
+
+        if with_explanation:
+            # Preprocess once; score and explain that same matrix with the same model
+            with stage("inference.predict_proba"):
+                Xt = model.named_steps["preprocessor"].transform(X)
+                predicted_label, proba_map = predict_proba_and_label(
+                    model.named_steps["classifier"], Xt
+                )
+            with stage("inference.explain"):
+                explainer = load_explainer(model_version)
+                contributions = explain_transformed(explainer, Xt)[0]
+                explanation = explanation_frame(explainer, contributions, predicted_label)
+        else:
+            with stage("inference.predict_proba"):
+                predicted_label, proba_map = predict_proba_and_label(model, X)
+
+        with stage("inference.build_prediction_row"):
+            # log the canonical values ("M" -> "male"), so drift sees one spelling
+            row = build_prediction_row(
+                features=result.records()[0],
+                predicted_label=predicted_label,
+                proba_map=proba_map,
+                model_version=model_version,
+            )
+
+    count("inference_predictions_total")
+
+    # best effort shadow scoring + logging to Supabase, after the user has their answer
+    _background.submit(log_prediction, row, X)
+
+    return predicted_label, proba_map, explanation
+
+
 def predict(features: dict[str, Any]) -> tuple[str, dict[str, float]]:
     """
     Main inference entrypoint.
@@ -109,24 +266,17 @@ def predict(features: dict[str, Any]) -> tuple[str, dict[str, float]]:
     - predicted label (string)
     - probability map for all classes
     """
-    model = load_model()
-    meta = load_model_meta()
-
-    X = make_input_df(features)
-    predicted_label, proba_map = predict_proba_and_label(model, X)
-
-    # best effort logging to Supabase
-    row = build_prediction_row(
-        features=features,
-        predicted_label=predicted_label,
-        proba_map=proba_map,
-        model_version=get_model_version(meta),
-    )
+    predicted_label, proba_map, _ = _predict(features, with_explanation=False)
+    return predicted_label, proba_map
 
-    try:
-        insert_prediction(row)
-    except Exception:
-        # never break inference UX if logging fails
-        pass
 
-    return predicted_label, proba_map
+def predict_and_explain(
+    features: dict[str, Any],
+) -> tuple[str, dict[str, float], pd.DataFrame]:
+    """
+    predict(), plus why: per-feature contributions (log-odds) towards the
+    predicted class, largest effect first. Both come from the same model
+    version, even if the champion is swapped meanwhile.
+    """
+    predicted_label, proba_map, explanation = _predict(features, with_explanation=True)
+    return predicted_label, proba_map, cast(pd.DataFrame, explanation)
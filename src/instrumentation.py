@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from src.config import PROFILE_DIR
+
+# Stage latency buckets in seconds (upper bounds, Prometheus style)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _env_enabled() -> bool:
+    return os.getenv("INSTRUMENTATION", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+# -----------------------------
+# 1) Metrics
+# -----------------------------
+class Histogram:
+    def __init__(self) -> None:
+        self.bucket_counts = [0] * (len(BUCKETS) + 1)  # last = +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.bucket_counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the q-th observation.
+        """
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip((*BUCKETS, self.max), self.bucket_counts, strict=True):
+            seen += n
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+class Registry:
+    """
+    Process-wide stage histograms and counters. Thread safe.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = _env_enabled()
+        self._lock = threading.Lock()
+        self.histograms: dict[str, Histogram] = {}
+        self.counters: dict[str, float] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            h = self.histograms.get(stage)
+            if h is None:
+                h = self.histograms[stage] = Histogram()
+            h.observe(seconds)
+
+    def inc(self, name: str, value: float = 1.0) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0.0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    # --- Export ---
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "stages": {
+                    stage: {
+                        "count": h.count,
+                        "sum_seconds": h.sum,
+                        "max_seconds": h.max,
+                        "p50_seconds": h.quantile(0.5),
+                        "p95_seconds": h.quantile(0.95),
+                        "buckets": dict(
+                            zip([*map(str, BUCKETS), "+Inf"], h.bucket_counts, strict=True)
+                        ),
+                    }
+                    for stage, h in self.histograms.items()
+                },
+                "counters": dict(self.counters),
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        lines = [
+            "# HELP stage_duration_seconds Wall time per pipeline stage.",
+            "# TYPE stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            for stage, h in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, n in zip([*map(str, BUCKETS), "+Inf"], h.bucket_counts, strict=True):
+                    cumulative += n
+                    lines.append(
+                        f'stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f'stage_duration_seconds_sum{{stage="{stage}"}} {h.sum}')
+                lines.append(f'stage_duration_seconds_count{{stage="{stage}"}} {h.count}')
+
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def to_markdown(self) -> str:
+        """
+        Stage timing table for the GitHub step summary.
+        """
+        stats = self.to_dict()
+        lines = [
+            "## Stage timings",
+            "| Stage | Calls | Total (s) | Mean (ms) | Max (ms) |",
+            "|---|---|---|---|---|",
+        ]
+        for stage, s in stats["stages"].items():
+            mean_ms = s["sum_seconds"] * 1000 / s["count"] if s["count"] else 0.0
+            lines.append(
+                f"| {stage} | {s['count']} | {s['sum_seconds']:.3f} "
+                f"| {mean_ms:.1f} | {s['max_seconds'] * 1000:.1f} |"
+            )
+        for name, value in stats["counters"].items():
+            lines.append(f"- {name}: {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str | Path) -> None:
+        """
+        Writes JSON for *.json paths, Prometheus text otherwise.
+        """
+        p = Path(path)
+        p.write_text(self.to_json() if p.suffix == ".json" else self.to_prometheus(), encoding="utf-8")
+
+
+REGISTRY = Registry()
+
+
+# -----------------------------
+# 2) Timing helpers
+# -----------------------------
+@contextmanager
+def _timed_stage(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        REGISTRY.inc(f"{stage.replace('.', '_')}_errors_total")
+        raise
+    finally:
+        REGISTRY.observe(stage, time.perf_counter() - start)
+
+
+def stage(name: str) -> AbstractContextManager[None]:
+    """
+    Times a block into the `name` histogram. A shared no-op when disabled.
+    """
+    if not REGISTRY.enabled:
+        return nullcontext()
+    return _timed_stage(name)
+
+
+def count(name: str, value: float = 1.0) -> None:
+    if REGISTRY.enabled:
+        REGISTRY.inc(name, value)
+
+
+# -----------------------------
+# 3) On-demand profiling
+# -----------------------------
+@contextmanager
+def _profiled(name: str, profiler: str) -> Iterator[None]:
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+
+    if profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError as e:
+            raise RuntimeError("PROFILE=pyinstrument requires: pip install pyinstrument") from e
+
+        p = Profiler()
+        p.start()
+        try:
+            yield
+        finally:
+            p.stop()
+            (PROFILE_DIR / f"{name}-{stamp}.html").write_text(p.output_html(), encoding="utf-8")
+        return
+
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        prof.dump_stats(str(PROFILE_DIR / f"{name}-{stamp}.prof"))
+
+
+def profile(name: str) -> AbstractContextManager[None]:
+    """
+    Profiles a block when PROFILE=cprofile or PROFILE=pyinstrument is set,
+    writing the capture to profiles/. Otherwise a no-op.
+    """
+    profiler = os.getenv("PROFILE", "").strip().lower()
+    if profiler not in {"cprofile", "pyinstrument"}:
+        return nullcontext()
+    return _profiled(name, profiler)
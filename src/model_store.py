@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, cast
+
+import joblib
+
+from src.config import CHALLENGER_PATH, CHAMPION_PATH, VERSIONS_DIR
+
+# models/
+#   champion.json                   <- {"model_version": ...} served
+#   challenger.json                 <- {"model_version": ...} scored in shadow
+#   versions/<model_version>/       <- every trained model, never modified
+#       model.joblib, model_meta.json, manifest.json (sha256 + size per file)
+#       explainer.joblib, ...       <- optional extras, listed in the manifest too
+
+MODEL_FILE = "model.joblib"
+META_FILE = "model_meta.json"
+MANIFEST_FILE = "manifest.json"
+EXPLAINER_FILE = "explainer.joblib"
+
+# Staging directories older than this belong to a save that was killed mid-write
+STALE_STAGING_SECONDS = 3600
+
+
+# -----------------------------
+# 1) Publishing
+# -----------------------------
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _fsync(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_pointer(path: Path, model_version: str) -> None:
+    """
+    Readers either see the old pointer or the new one, never a partial file.
+    """
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_text(json.dumps({"model_version": model_version}), encoding="utf-8")
+    _fsync(tmp)
+    os.replace(tmp, path)
+
+
+def _remove_stale_staging() -> None:
+    cutoff = time.time() - STALE_STAGING_SECONDS
+    for p in VERSIONS_DIR.glob(".staging-*"):
+        try:
+            stale = p.stat().st_mtime < cutoff
+        except FileNotFoundError:
+            continue  # removed by a concurrent save
+        if stale:
+            shutil.rmtree(p, ignore_errors=True)
+
+
+def version_dir(model_version: str) -> Path:
+    return VERSIONS_DIR / model_version
+
+
+def save_version(
+    pipeline,
+    meta: dict[str, Any],
+    compress: int = 0,
+    extras: dict[str, Any] | None = None,
+) -> Path:
+    """
+    Writes a complete version into a staging directory, then renames it into
+    place, so a version directory is never seen half-written.
+
+    compress=0 (default) keeps numpy arrays uncompressed so they can be
+    memory-mapped on load; compress>0 trades load speed for a smaller file.
+    extras ({file name: object}) are stored next to the model with joblib.
+    """
+    model_version = str(meta["model_version"])
+    final = version_dir(model_version)
+    if final.exists():
+        raise FileExistsError(f"Model version {model_version} already exists in {VERSIONS_DIR}")
+
+    VERSIONS_DIR.mkdir(parents=True, exist_ok=True)
+    _remove_stale_staging()
+    staging = VERSIONS_DIR / f".staging-{model_version}-{uuid.uuid4().hex}"
+    staging.mkdir()
+
+    try:
+        joblib.dump(pipeline, staging / MODEL_FILE, compress=compress)
+        (staging / META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        for name, obj in (extras or {}).items():
+            joblib.dump(obj, staging / name, compress=compress)
+
+        files = [MODEL_FILE, META_FILE, *(extras or {})]
+        manifest = {
+            "model_version": model_version,
+            "compress": compress,
+            "files": {
+                name: {"sha256": _sha256(staging / name), "bytes": (staging / name).stat().st_size}
+                for name in files
+            },
+        }
+        (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+        for name in (*files, MANIFEST_FILE):
+            _fsync(staging / name)
+
+        os.rename(staging, final)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    return final
+
+
+def list_versions() -> list[str]:
+    if not VERSIONS_DIR.exists():
+        return []
+    return sorted(
+        p.name
+        for p in VERSIONS_DIR.iterdir()
+        if not p.name.startswith(".") and (p / MANIFEST_FILE).exists()
+    )
+
+
+# -----------------------------
+# 2) Loading
+# -----------------------------
+def load_manifest(model_version: str) -> dict[str, Any]:
+    path = version_dir(model_version) / MANIFEST_FILE
+    if not path.exists():
+        raise FileNotFoundError(f"Model version {model_version} not found in {VERSIONS_DIR}")
+    return cast(dict[str, Any], json.loads(path.read_text(encoding="utf-8")))
+
+
+def verify_version(model_version: str) -> dict[str, Any]:
+    """
+    Checks every file against the manifest. Returns the manifest.
+    """
+    manifest = load_manifest(model_version)
+    d = version_dir(model_version)
+    for name, expected in manifest["files"].items():
+        if _sha256(d / name) != expected["sha256"]:
+            raise ValueError(f"Checksum mismatch for {d / name}")
+    return manifest
+
+
+@lru_cache(maxsize=4)
+def load_artifacts(model_version: str) -> tuple[Any, dict[str, Any]]:
+    """
+    (model, meta) for a version. Versions are immutable, so the checksum is
+    verified once and the loaded objects are cached by name.
+    """
+    manifest = verify_version(model_version)
+    d = version_dir(model_version)
+
+    # Memory-mapping only works on uncompressed joblib files
+    mmap_mode = "r" if not manifest.get("compress") else None
+    model = joblib.load(d / MODEL_FILE, mmap_mode=mmap_mode)
+    meta = cast(dict[str, Any], json.loads((d / META_FILE).read_text(encoding="utf-8")))
+
+    return model, meta
+
+
+@lru_cache(maxsize=4)
+def load_extra(model_version: str, name: str) -> Any | None:
+    """
+    An extra file saved with the version, or None if that version has none.
+    """
+    load_artifacts(model_version)  # checksums every manifest file, extras included
+    manifest = load_manifest(model_version)
+    if name not in manifest["files"]:
+        return None
+
+    mmap_mode = "r" if not manifest.get("compress") else None
+    return joblib.load(version_dir(model_version) / name, mmap_mode=mmap_mode)
+
+
+def load_version(model_version: str):
+    return load_artifacts(model_version)[0]
+
+
+def load_version_meta(model_version: str) -> dict[str, Any]:
+    return load_artifacts(model_version)[1]
+
+
+# -----------------------------
+# 3) Champion / Challenger
+# -----------------------------
+def _read_pointer(path: Path) -> str | None:
+    if not path.exists():
+        return None
+    return cast(str | None, json.loads(path.read_text(encoding="utf-8")).get("model_version"))
+
+
+def get_champion_version() -> str | None:
+    return _read_pointer(CHAMPION_PATH)
+
+
+def get_challenger_version() -> str | None:
+    return _read_pointer(CHALLENGER_PATH)
+
+
+def set_challenger(model_version: str | None) -> None:
+    if model_version is None:
+        CHALLENGER_PATH.unlink(missing_ok=True)
+        return
+    load_manifest(model_version)
+    _write_pointer(CHALLENGER_PATH, model_version)
+
+
+def promote(model_version: str) -> None:
+    """
+    Makes a stored version the served champion (atomic pointer swap) and
+    clears it as challenger.
+    """
+    verify_version(model_version)
+    _write_pointer(CHAMPION_PATH, model_version)
+
+    if get_challenger_version() == model_version:
+        set_challenger(None)
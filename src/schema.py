@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import cast
+
+import numpy as np
+import pandas as pd
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+
+from src.config import FEATURES
+from src.transformers import AGE_RANGE, GENDER_ALIASES, MOTOR_VALUE_RANGE
+
+NUMERIC_RANGES: dict[str, tuple[float, float]] = {
+    "Age": AGE_RANGE,
+    "MotorValue": MOTOR_VALUE_RANGE,
+}
+
+# Spellings accepted on top of the encoder categories (matched case-insensitively)
+CATEGORY_ALIASES: dict[str, dict[str, str]] = {
+    "Gender": GENDER_ALIASES,
+}
+
+
+class InvalidInputError(ValueError):
+    """
+    A request rejected by the model's input schema (as opposed to a model or
+    loading failure).
+    """
+
+
+# -----------------------------
+# 1) Compiled Schema
+# -----------------------------
+@dataclass(frozen=True)
+class InputSchema:
+    """
+    Input domain of a fitted pipeline:
+    - categorical: {column: {lowercased spelling: canonical category}}
+    - numeric: {column: (low, high)}, inclusive
+    - nullable: columns the pipeline imputes, so missing values are allowed
+    """
+
+    categorical: dict[str, dict[str, str]] = field(default_factory=dict)
+    numeric: dict[str, tuple[float, float]] = field(default_factory=dict)
+    nullable: frozenset[str] = frozenset()
+
+    def __post_init__(self) -> None:
+        # Sorted key / canonical arrays per column, for np.searchsorted lookups
+        index = {}
+        for col, lookup in self.categorical.items():
+            keys = np.array(sorted(lookup), dtype=str)
+            index[col] = (keys, np.array([lookup[k] for k in keys], dtype=object))
+        object.__setattr__(self, "_index", index)
+
+    def lookup(self, col: str, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Case-insensitive category lookup for a column of strings.
+        Returns (canonical values, found mask).
+        """
+        keys, canonical = self._index[col]  # type: ignore[attr-defined]
+        lowered = np.char.lower(np.char.strip(values.astype(str)))
+        pos = np.searchsorted(keys, lowered).clip(max=len(keys) - 1)
+        found = keys[pos] == lowered
+        return np.where(found, canonical[pos], np.nan), found
+
+
+def compile_schema(pipeline: Pipeline) -> InputSchema:
+    """
+    Reads categories from the fitted encoders in the ColumnTransformer.
+    Imputer fill values (e.g. "missing") are not accepted as input.
+    """
+    preprocessor = pipeline.named_steps["preprocessor"]
+
+    categorical: dict[str, dict[str, str]] = {}
+    numeric: dict[str, tuple[float, float]] = {}
+    nullable: set[str] = set()
+
+    for name, transformer, cols in preprocessor.transformers_:
+        if name == "remainder":
+            continue
+
+        steps = [s for _, s in transformer.steps] if isinstance(transformer, Pipeline) else [transformer]
+        imputer = next((s for s in steps if isinstance(s, SimpleImputer)), None)
+        encoder = next((s for s in steps if hasattr(s, "categories_")), None)
+
+        if imputer is not None:
+            nullable.update(cols)
+
+        for i, col in enumerate(cols):
+            if encoder is None:
+                numeric[col] = NUMERIC_RANGES.get(col, (-np.inf, np.inf))
+                continue
+
+            fill_value = imputer.fill_value if imputer is not None else None
+            lookup = {
+                str(c).lower(): str(c)
+                for c in encoder.categories_[i]
+                if isinstance(c, str) and c != fill_value
+            }
+            for alias, canonical in CATEGORY_ALIASES.get(col, {}).items():
+                if canonical.lower() in lookup:
+                    lookup[alias.lower()] = lookup[canonical.lower()]
+            categorical[col] = lookup
+
+    return InputSchema(categorical=categorical, numeric=numeric, nullable=frozenset(nullable))
+
+
+# -----------------------------
+# 2) Validation / Coercion
+# -----------------------------
+@dataclass
+class ValidationResult:
+    """
+    frame: coerced batch in FEATURES order (invalid cells set to missing)
+    errors: boolean mask, same shape as frame, True where a cell is invalid
+    raw: the input batch, for error messages
+    """
+
+    frame: pd.DataFrame
+    errors: pd.DataFrame
+    raw: pd.DataFrame
+
+    @property
+    def valid(self) -> np.ndarray:
+        return cast(np.ndarray, ~self.errors.to_numpy().any(axis=1))
+
+    def messages(self, i: int) -> list[str]:
+        """
+        Human-readable errors for the i-th row (only call for invalid rows).
+        """
+        row = self.errors.iloc[i]
+        out = []
+        for col in row.index[row.to_numpy()]:
+            value = self.raw.iloc[i][col]
+            if isinstance(value, np.generic):
+                value = value.item()
+            out.append(f"{col}: invalid value {value!r}")
+        return out
+
+    def records(self) -> list[dict]:
+        """
+        Coerced rows as plain dicts, with None for missing values.
+        """
+        out = self.frame.astype(object).where(self.frame.notna(), None)
+        return cast(list[dict], out.to_dict(orient="records"))
+
+
+def validate(schema: InputSchema, df: pd.DataFrame) -> ValidationResult:
+    """
+    Validates and coerces a whole batch with one vectorized pass per column.
+    Never raises for bad values; inspect `errors` / `valid` instead.
+    """
+    raw = df.reindex(columns=FEATURES)
+    columns: dict[str, np.ndarray] = {}
+    errors = np.zeros((len(raw), len(FEATURES)), dtype=bool)
+
+    for j, col in enumerate(FEATURES):
+        values = raw[col].to_numpy(dtype=object)
+        missing = pd.isna(values)
+
+        if col in schema.categorical:
+            coerced, found = schema.lookup(col, values)
+            bad = ~found & ~missing
+        else:
+            low, high = schema.numeric.get(col, (-np.inf, np.inf))
+            # copy: for a float column this would be a view of raw, which messages() reads
+            coerced = pd.to_numeric(raw[col], errors="coerce").to_numpy(dtype=float, copy=True)
+            with np.errstate(invalid="ignore"):
+                bad = (np.isnan(coerced) & ~missing) | np.isinf(coerced) | (coerced < low) | (coerced > high)
+
+        if col not in schema.nullable:
+            bad |= missing
+
+        # NaN (not None) is what the pipeline's imputers treat as missing
+        coerced[bad | missing] = np.nan
+
+        columns[col] = coerced
+        errors[:, j] = bad
+
+    return ValidationResult(
+        frame=pd.DataFrame(columns, index=raw.index),
+        errors=pd.DataFrame(errors, index=raw.index, columns=FEATURES),
+        raw=raw,
+    )
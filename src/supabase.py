@@ -58,6 +58,58 @@ def insert_prediction(row: dict[str, Any]) -> None:
     r.raise_for_status()
 
 
+def _fetch_since(
+    table: str, select: str, since: str | None, page_size: int = 1000
+) -> list[dict[str, Any]]:
+    """
+    Pages through rows with ts >= since (oldest first). Callers drop the
+    boundary rows they already hold by id.
+    """
+    url = _get_url()
+    key = _get_anon_key()
+
+    rows: list[dict[str, Any]] = []
+    offset = 0
+    while True:
+        params = {
+            "select": select,
+            "order": "ts.asc,id.asc",
+            "limit": str(page_size),
+            "offset": str(offset),
+        }
+        if since is not None:
+            params["ts"] = f"gte.{since}"
+
+        r = requests.get(f"{url}/rest/v1/{table}", headers=_headers(key), params=params)
+        r.raise_for_status()
+
+        page = cast(list[dict[str, Any]], r.json())
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        offset += page_size
+
+
+def fetch_monitoring_metrics(since: str | None = None) -> list[dict[str, Any]]:
+    """
+    Monitoring runs newer than `since`. Read with the anon key for the
+    Streamlit Monitoring page.
+    """
+    return _fetch_since(
+        "monitoring_metrics",
+        "id,ts,model_version,window_days,current_rows,drift_share,"
+        "drifted_features,threshold,retrain_triggered,report_sha256",
+        since,
+    )
+
+
+def fetch_prediction_labels(since: str | None = None) -> list[dict[str, Any]]:
+    """
+    Prediction timestamps and labels (no customer features) newer than `since`.
+    """
+    return _fetch_since("prediction_labels", "id,ts,model_version,predicted_label", since)
+
+
 # -----------------------------
 # Monitoring use case (service_role)
 # -----------------------------
@@ -96,4 +148,21 @@ def insert_monitoring_metrics(row: dict[str, Any]) -> None:
     if r.status_code >= 400:
         logger.error("Supabase INSERT monitoring_metrics error: %s", r.text)
 
-    r.raise_for_status()
\ No newline at end of file
+    r.raise_for_status()
+
+
+def update_monitoring_metrics(run_id: str, fields: dict[str, Any]) -> None:
+    url = _get_url()
+    key = _get_service_role_key()
+
+    endpoint = f"{url}/rest/v1/monitoring_metrics"
+    r = requests.patch(
+        endpoint, headers=_headers(key), params={"run_id": f"eq.{run_id}"}, json=fields
+    )
+
+    logger.info("Supabase UPDATE monitoring_metrics status: %s", r.status_code)
+
+    if r.status_code >= 400:
+        logger.error("Supabase UPDATE monitoring_metrics error: %s", r.text)
+
+    r.raise_for_status()
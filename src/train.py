@@ -1,15 +1,19 @@
 from __future__ import annotations
 
-import json
+import multiprocessing
+import os
+import sys
+import time
 from datetime import datetime, timezone
+from typing import Any
 
-import joblib
+import numpy as np
 import pandas as pd
 from sklearn.compose import ColumnTransformer
 from sklearn.ensemble import GradientBoostingClassifier
 from sklearn.impute import SimpleImputer
-from sklearn.metrics import balanced_accuracy_score
-from sklearn.model_selection import train_test_split
+from sklearn.metrics import balanced_accuracy_score, recall_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, OrdinalEncoder
 from sklearn.utils.class_weight import compute_sample_weight
@@ -18,10 +22,10 @@ from src.config import (
     DATASET_PATH,
     FEATURES,
     MODEL_DIR,
-    MODEL_META_PATH,
-    MODEL_PATH,
     TARGET,
 )
+from src.explain import PathExplainer, build_explainer
+from src.model_store import EXPLAINER_FILE, promote as promote_version, save_version
 from src.transformers import clamp_age, clamp_motor_value, fix_gender
 
 
@@ -46,12 +50,15 @@ def clean_target(y: pd.Series) -> pd.Series:
     return y.replace({"P": "Phone", "E": "Email", "S": "SMS"})
 
 
+def get_xy(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
+    return df[FEATURES].copy(), clean_target(df[TARGET].copy())
+
+
 def split_data(df: pd.DataFrame):
     """
     Returns stratified train/test split.
     """
-    X = df[FEATURES].copy()
-    y = clean_target(df[TARGET].copy())
+    X, y = get_xy(df)
 
     return train_test_split(X, y, test_size=0.2, random_state=123, stratify=y)
 
@@ -208,29 +215,135 @@ def evaluate(pipeline: Pipeline, X_test: pd.DataFrame, y_test: pd.Series) -> flo
 
 
 # -----------------------------
-# 5) Saving Artifacts
+# 5) Cross-Validation
 # -----------------------------
-def save_artifacts(pipeline: Pipeline, score: float) -> None:
-    MODEL_DIR.mkdir(parents=True, exist_ok=True)
+# Set once per worker by the pool initializer, so each fold task only ships indices
+_CV_DATA: tuple[pd.DataFrame, pd.Series] | None = None
+
+
+def _init_cv_worker(X: pd.DataFrame, y: pd.Series) -> None:
+    global _CV_DATA
+    _CV_DATA = (X, y)
+
+
+def _run_fold(fold: int, train_idx: np.ndarray, test_idx: np.ndarray) -> dict[str, Any]:
+    if _CV_DATA is None:
+        raise RuntimeError("_run_fold must run in a pool started by cross_validate")
+    X, y = _CV_DATA
+
+    start = time.perf_counter()
+    pipeline = fit_pipeline(build_pipeline(), X.iloc[train_idx], y.iloc[train_idx])
+    preds = pipeline.predict(X.iloc[test_idx])
+    classes = sorted(y.unique())
+    recall = recall_score(y.iloc[test_idx], preds, labels=classes, average=None)
+
+    return {
+        "fold": fold,
+        "balanced_accuracy": float(balanced_accuracy_score(y.iloc[test_idx], preds)),
+        "recall": dict(zip(classes, recall.tolist(), strict=True)),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def cross_validate(
+    X: pd.DataFrame,
+    y: pd.Series,
+    n_splits: int = 5,
+    n_jobs: int | None = None,
+    max_seconds: float | None = None,
+) -> dict[str, Any]:
+    """
+    Stratified k-fold balanced accuracy, folds fitted in parallel processes.
+
+    With max_seconds, folds still running at the deadline are dropped and
+    the workers terminated; the summary covers the completed folds only.
+    """
+    n_jobs = min(n_splits, n_jobs or os.cpu_count() or 1)
+    folds = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=123).split(X, y)
+
+    start = time.perf_counter()
+    deadline = None if max_seconds is None else start + max_seconds
+    results: list[dict[str, Any]] = []
+
+    pool = multiprocessing.Pool(processes=n_jobs, initializer=_init_cv_worker, initargs=(X, y))
+    try:
+        pending = [pool.apply_async(_run_fold, (i, tr, te)) for i, (tr, te) in enumerate(folds)]
+        for job in pending:
+            timeout = None if deadline is None else max(deadline - time.perf_counter(), 0)
+            try:
+                results.append(job.get(timeout=timeout))
+            except multiprocessing.TimeoutError:
+                break
+    finally:
+        pool.terminate()
+        pool.join()
+
+    scores = np.array([r["balanced_accuracy"] for r in results])
+    recall = pd.DataFrame([r["recall"] for r in results])
+
+    return {
+        "n_splits": n_splits,
+        "completed_folds": len(results),
+        "balanced_accuracy_mean": float(scores.mean()) if len(scores) else None,
+        "balanced_accuracy_std": float(scores.std()) if len(scores) else None,
+        "recall_by_class": {k: float(v) for k, v in recall.mean().items()},
+        "fold_seconds": [round(r["seconds"], 3) for r in results],
+        "wall_seconds": round(time.perf_counter() - start, 3),
+        "n_jobs": n_jobs,
+        "max_seconds": max_seconds,
+    }
 
-    joblib.dump(pipeline, MODEL_PATH)
 
+# -----------------------------
+# 6) Saving Artifacts
+# -----------------------------
+def save_artifacts(
+    pipeline: Pipeline,
+    score: float,
+    promote: bool = True,
+    cv: dict[str, Any] | None = None,
+    explainer: PathExplainer | None = None,
+) -> str:
+    """
+    Stores the model (and its explainer, if given) as a new version. With
+    promote=False it is kept as a challenger only and the served model is
+    left untouched.
+    """
+    MODEL_DIR.mkdir(parents=True, exist_ok=True)
+
+    now = datetime.now(timezone.utc)
     meta = {
-        "model_version": datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S"),
-        "trained_at_utc": datetime.now(timezone.utc).isoformat(),
+        "model_version": now.strftime("%Y%m%d%H%M%S"),
+        "trained_at_utc": now.isoformat(),
         "balanced_accuracy": score,
+        "cv": cv,
         "features": FEATURES,
         "target": TARGET,
         "model_type": "GradientBoostingClassifier",
     }
 
-    MODEL_META_PATH.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    model_version = str(meta["model_version"])
+    extras = {EXPLAINER_FILE: explainer} if explainer is not None else None
+    save_version(pipeline, meta, extras=extras)
+
+    if promote:
+        promote_version(model_version)
+
+    return model_version
 
 
 # -----------------------------
-# 6) Main Entry Point
+# 7) Main Entry Point
 # -----------------------------
-def main() -> None:
+# Fast mode (cron retrain): fewer folds and a hard wall-time cap for the CV stage
+FAST_CV_SPLITS = 3
+FAST_CV_MAX_SECONDS = 120.0
+
+
+def main(promote: bool = True, fast: bool = False, cv: bool = True) -> str:
+    """
+    cv=False skips cross-validation (meta "cv" is then null), e.g. for quick smoke runs.
+    """
     df = load_dataset()
 
     X_train, X_test, y_train, y_test = split_data(df)
@@ -240,11 +353,33 @@ def main() -> None:
 
     score = evaluate(pipeline, X_test, y_test)
 
-    save_artifacts(pipeline, score)
+    cv_summary = None
+    if cv:
+        X, y = get_xy(df)
+        if fast:
+            cv_summary = cross_validate(X, y, n_splits=FAST_CV_SPLITS, max_seconds=FAST_CV_MAX_SECONDS)
+        else:
+            cv_summary = cross_validate(X, y)
+
+    explainer = build_explainer(pipeline, X_train)
+
+    model_version = save_artifacts(
+        pipeline, score, promote=promote, cv=cv_summary, explainer=explainer
+    )
 
     print("Training complete.")
+    print(f"Model version: {model_version}")
     print(f"Balanced Accuracy: {score:.4f}")
+    if cv_summary and cv_summary["completed_folds"]:
+        print(
+            f"CV Balanced Accuracy: {cv_summary['balanced_accuracy_mean']:.4f} "
+            f"± {cv_summary['balanced_accuracy_std']:.4f} "
+            f"({cv_summary['completed_folds']}/{cv_summary['n_splits']} folds, "
+            f"{cv_summary['wall_seconds']:.1f}s)"
+        )
+
+    return model_version
 
 
 if __name__ == "__main__":
-    main()
+    main(fast="--fast" in sys.argv[1:])
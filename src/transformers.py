@@ -1,14 +1,19 @@
 import numpy as np
 import pandas as pd
 
+# Valid input domains, shared with the inference input schema (src/schema.py)
+AGE_RANGE = (18, 100)
+MOTOR_VALUE_RANGE = (0, 100000)
+GENDER_ALIASES = {"f": "female", "m": "male"}
+
 
 def clamp_age(x):
-    return np.clip(x, 18, 100)
+    return np.clip(x, *AGE_RANGE)
 
 
 def clamp_motor_value(x):
-    return np.clip(x, 0, 100000)
+    return np.clip(x, *MOTOR_VALUE_RANGE)
 
 
 def fix_gender(df: pd.DataFrame):
-    return df.replace({"f": "female", "m": "male"})
+    return df.replace(GENDER_ALIASES)
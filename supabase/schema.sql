@@ -35,9 +35,18 @@ create table if not exists predictions (
   predicted_label text not null,
   proba_email double precision,
   proba_phone double precision,
-  proba_sms double precision
+  proba_sms double precision,
+
+  -- ---------
+  -- Shadow challenger (null when no challenger is set)
+  -- ---------
+  shadow_model_version text,
+  shadow_predicted_label text
 );
 
+alter table predictions add column if not exists shadow_model_version text;
+alter table predictions add column if not exists shadow_predicted_label text;
+
 create index if not exists idx_predictions_ts on predictions(ts);
 
 
@@ -47,6 +56,9 @@ create index if not exists idx_predictions_ts on predictions(ts);
 create table if not exists monitoring_metrics (
   id bigserial primary key,
 
+  -- one row per monitoring job run; reruns of the same job resume, not duplicate
+  run_id text unique,
+
   ts timestamptz not null,
   model_version text not null,
 
@@ -57,9 +69,15 @@ create table if not exists monitoring_metrics (
   drifted_features jsonb not null,
 
   threshold double precision not null,
-  retrain_triggered boolean not null
+  retrain_triggered boolean not null,
+
+  -- sha256 of the uncompressed HTML report; stored as monitoring/reports/<sha256>.html.gz (null when not rendered)
+  report_sha256 text
 );
 
+alter table monitoring_metrics add column if not exists report_sha256 text;
+alter table monitoring_metrics add column if not exists run_id text unique;
+
 create index if not exists idx_monitoring_metrics_ts on monitoring_metrics(ts);
 
 
@@ -92,8 +110,34 @@ for insert
 to service_role
 with check (true);
 
+-- the report hash is attached after the row is inserted
+create policy "service role can update monitoring metrics"
+on monitoring_metrics
+for update
+to service_role
+using (true);
+
 create policy "service role can read monitoring metrics"
 on monitoring_metrics
 for select
 to service_role
 using (true);
+
+-- Streamlit (anon) reads run history for the Monitoring page
+create policy "anon can read monitoring metrics"
+on monitoring_metrics
+for select
+to anon
+using (true);
+
+
+-- ==========================================
+-- VIEW: prediction_labels
+-- ==========================================
+-- Volume / label mix for the Monitoring page without exposing customer features.
+-- The view runs with the owner's rights, so anon needs no select on predictions.
+create or replace view prediction_labels as
+select id, ts, model_version, predicted_label
+from predictions;
+
+grant select on prediction_labels to anon;
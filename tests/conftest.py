@@ -4,3 +4,32 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+import pytest  # noqa: E402
+
+from src import inference, model_store  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_model_store(tmp_path, monkeypatch):
+    """
+    Tests train into a temporary store so they never touch the served models/.
+    """
+    monkeypatch.setattr(model_store, "VERSIONS_DIR", tmp_path / "versions")
+    monkeypatch.setattr(model_store, "CHAMPION_PATH", tmp_path / "champion.json")
+    monkeypatch.setattr(model_store, "CHALLENGER_PATH", tmp_path / "challenger.json")
+    _clear_caches()
+    yield tmp_path
+    _clear_caches()
+
+
+def _clear_caches() -> None:
+    # Versions are timestamps, so two tests can reuse one name for different models
+    for cached in (
+        model_store.load_artifacts,
+        model_store.load_extra,
+        inference.load_schema,
+        inference.load_explainer,
+    ):
+        cached.cache_clear()
@@ -0,0 +1,45 @@
+from monitoring.evaluate_challenger import compare, should_promote
+from src import model_store
+from src.train import load_dataset, main as train_main, split_data
+
+
+def test_challenger_is_stored_and_compared():
+    version = train_main(promote=False, cv=False)
+    model_store.set_challenger(version)
+
+    assert model_store.list_versions() == [version]
+    assert model_store.get_challenger_version() == version
+
+    challenger = model_store.load_version(version)
+    _, X_test, _, y_test = split_data(load_dataset())
+
+    result = compare(challenger, challenger, X_test, X_test, y_test)
+
+    assert result["rows"] == len(X_test)
+    assert result["agreement"] == 1.0
+    ba = result["balanced_accuracy"]
+    assert ba["champion"] == ba["challenger"]
+
+
+def test_promotion_requires_challenger_not_worse():
+    def decide(holdout, champion_cv, challenger_cv):
+        return should_promote(
+            {
+                "balanced_accuracy": {"champion": holdout[0], "challenger": holdout[1]},
+                "cv_balanced_accuracy": {"champion": champion_cv, "challenger": challenger_cv},
+            }
+        )
+
+    # worse CV mean: never promoted, even with a better holdout score
+    assert not decide((0.70, 0.80), (0.75, 0.02), (0.74, 0.01))
+
+    # ahead by more than the fold std: promoted despite a worse holdout score
+    assert decide((0.80, 0.70), (0.75, 0.01), (0.78, 0.01))
+
+    # ahead within the noise: the holdout score decides
+    assert decide((0.70, 0.71), (0.75, 0.02), (0.76, 0.02))
+    assert not decide((0.80, 0.70), (0.75, 0.02), (0.76, 0.02))
+
+    # older versions without cv in their meta fall back to the holdout score
+    assert not decide((0.80, 0.70), None, (0.90, 0.01))
+    assert decide((0.70, 0.80), None, (0.60, 0.01))
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from src.config import DATASET_PATH, FEATURES
+from src.explain import build_explainer, explain_batch
+from src.inference import load_explainer, predict, predict_and_explain
+from src.model_store import load_version
+from src.train import main as train_main
+
+FEATURES_ROW = {
+    "Age": 35,
+    "MotorValue": 15000,
+    "HealthDependentsAdults": 1,
+    "HealthDependentsKids": 0,
+    "CreditCardType": "Visa",
+    "MotorType": "Single",
+    "HealthType": "Level3",
+    "TravelType": "Premium",
+    "MotorInsurance": "Yes",
+    "HealthInsurance": "No",
+    "TravelInsurance": "No",
+    "Gender": "male",
+    "Location": "Urban",
+}
+
+
+def test_attributions_add_up_to_raw_scores():
+    version = train_main(cv=False)
+    model = load_version(version)
+    explainer = load_explainer(version)
+    X = pd.read_csv(DATASET_PATH, usecols=FEATURES, nrows=300)
+
+    contributions = explain_batch(model, explainer, X)
+
+    assert contributions.shape == (len(X), 3, len(FEATURES))
+    assert explainer.features == FEATURES
+    np.testing.assert_allclose(
+        explainer.bias + contributions.sum(axis=2), model.decision_function(X), atol=1e-9
+    )
+
+    # a single row gets the same answer as inside a batch
+    np.testing.assert_allclose(explain_batch(model, explainer, X.iloc[[7]])[0], contributions[7])
+
+    # tables stored at training time match a fresh build
+    rebuilt = build_explainer(model, X)
+    np.testing.assert_allclose(rebuilt.tables, explainer.tables)
+
+
+def test_predict_and_explain_single_request():
+    train_main(cv=False)
+
+    label, proba_map, df = predict_and_explain(FEATURES_ROW)
+
+    assert (label, proba_map) == predict(FEATURES_ROW)
+    assert sorted(df.index) == sorted(FEATURES)
+    assert df["Contribution"].abs().is_monotonic_decreasing
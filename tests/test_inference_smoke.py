@@ -1,13 +1,15 @@
-from src.config import MODEL_META_PATH, MODEL_PATH
+import pytest
+
+from src import model_store
 from src.inference import predict
+from src.schema import InvalidInputError
 from src.train import main as train_main
 
 
 def test_inference_multiclass_smoke():
-    train_main()
+    version = train_main(cv=False)
 
-    assert MODEL_PATH.exists()
-    assert MODEL_META_PATH.exists()
+    assert model_store.get_champion_version() == version
 
     features = {
         "Age": 35,
@@ -31,3 +33,26 @@ def test_inference_multiclass_smoke():
     assert isinstance(proba_map, dict)
     assert len(proba_map) == 3
     assert abs(sum(proba_map.values()) - 1.0) < 1e-6
+
+
+def test_inference_rejects_unknown_category():
+    train_main(cv=False)
+
+    features = {
+        "Age": 35,
+        "MotorValue": 15000,
+        "HealthDependentsAdults": 1,
+        "HealthDependentsKids": 0,
+        "CreditCardType": "Vias",
+        "MotorType": "Single",
+        "HealthType": "Level3",
+        "TravelType": "Premium",
+        "MotorInsurance": "Yes",
+        "HealthInsurance": "No",
+        "TravelInsurance": "No",
+        "Gender": "Male",
+        "Location": "Urban",
+    }
+
+    with pytest.raises(InvalidInputError, match="CreditCardType"):
+        predict(features)
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from src import instrumentation
+from src.instrumentation import REGISTRY, count, stage
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    REGISTRY.reset()
+    yield
+    REGISTRY.reset()
+
+
+def test_stages_are_recorded_and_exported():
+    for _ in range(3):
+        with stage("demo.fast"):
+            pass
+    with pytest.raises(ValueError):
+        with stage("demo.fails"):
+            raise ValueError
+    count("demo_total", 2)
+
+    stats = json.loads(REGISTRY.to_json())
+    assert stats["stages"]["demo.fast"]["count"] == 3
+    assert stats["counters"] == {"demo_fails_errors_total": 1.0, "demo_total": 2.0}
+
+    text = REGISTRY.to_prometheus()
+    assert 'stage_duration_seconds_bucket{stage="demo.fast",le="+Inf"} 3' in text
+    assert 'stage_duration_seconds_count{stage="demo.fails"} 1' in text
+    assert "| demo.fast | 3 |" in REGISTRY.to_markdown()
+
+
+def test_disabled_registry_records_nothing(monkeypatch):
+    monkeypatch.setattr(REGISTRY, "enabled", False)
+
+    with stage("demo.off"):
+        pass
+    count("demo_off_total")
+
+    assert REGISTRY.to_dict() == {"stages": {}, "counters": {}}
+
+
+def test_cprofile_capture_on_demand(tmp_path, monkeypatch):
+    monkeypatch.setattr(instrumentation, "PROFILE_DIR", tmp_path)
+    monkeypatch.setenv("PROFILE", "cprofile")
+
+    with instrumentation.profile("demo"):
+        sum(range(1000))
+
+    assert len(list(tmp_path.glob("demo-*.prof"))) == 1
+
+
+def test_shadow_failures_are_counted(monkeypatch):
+    from src import inference
+
+    def broken_challenger():
+        raise RuntimeError("challenger missing")
+
+    monkeypatch.setattr(inference, "load_challenger", broken_challenger)
+    monkeypatch.setattr(inference, "insert_prediction", lambda row: None)
+
+    inference.log_prediction({"model_version": "v1"}, None)
+
+    counters = REGISTRY.to_dict()["counters"]
+    assert counters["inference_shadow_failures_total"] == 1.0
+    assert "inference_log_failures_total" not in counters
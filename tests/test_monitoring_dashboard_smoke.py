@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from monitoring.dashboard import (
+    IncrementalFrame,
+    feature_drift_frequency,
+    label_mix,
+    prediction_volume,
+)
+from src.config import FEATURES
+
+
+def _rows(start_id: int, n: int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": i,
+            "ts": (now - timedelta(hours=n - i)).isoformat(),
+            "predicted_label": ["Email", "Phone", "SMS"][i % 3],
+        }
+        for i in range(start_id, start_id + n)
+    ]
+
+
+def test_incremental_frame_only_appends_new_rows():
+    table = _rows(0, 5)
+    calls = []
+
+    def fetch(since):
+        calls.append(since)
+        # mimic ts >= since, so the boundary row comes back again
+        return [r for r in table if since is None or r["ts"] >= since]
+
+    frame = IncrementalFrame(fetch)
+    assert len(frame.refresh()) == 5
+
+    table.extend(_rows(5, 3))
+    df = frame.refresh()
+
+    assert calls[0] is None and calls[1] == table[4]["ts"]
+    assert df["id"].tolist() == list(range(8))
+    assert prediction_volume(df).sum() == 8
+    assert (label_mix(df).sum(axis=1).round(6) == 1.0).all()
+
+
+def test_incremental_frame_picks_up_updated_boundary_row():
+    table = _rows(0, 3)
+
+    frame = IncrementalFrame(lambda since: [r for r in table if since is None or r["ts"] >= since])
+    frame.refresh()
+
+    # e.g. the report hash attached to the latest metrics row after it was synced
+    table[-1] = {**table[-1], "predicted_label": "Updated"}
+    df = frame.refresh()
+
+    assert df["id"].tolist() == [0, 1, 2]
+    assert df["predicted_label"].iloc[-1] == "Updated"
+
+
+def test_feature_drift_frequency():
+    metrics = pd.DataFrame(
+        {"drifted_features": [{"Age": True, "Gender": False}, {"Age": True, "Gender": True}]}
+    )
+    freq = feature_drift_frequency(metrics)
+
+    assert set(freq.index) == set(FEATURES)
+    assert freq["Age"] == 1.0
+    assert freq["Gender"] == 0.5
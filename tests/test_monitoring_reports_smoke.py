@@ -0,0 +1,27 @@
+from monitoring import reports
+
+
+class FakeReport:
+    def get_html(self) -> str:
+        return "<html><body>drift</body></html>"
+
+
+def test_report_roundtrip_is_content_addressed(tmp_path, monkeypatch):
+    monkeypatch.setattr(reports, "REPORTS_DIR", tmp_path)
+
+    sha_1 = reports.save_report(FakeReport())
+    sha_2 = reports.save_report(FakeReport())
+
+    assert sha_1 == sha_2
+    assert len(list(tmp_path.glob("*.html.gz"))) == 1
+    assert reports.load_report_html(sha_1) == FakeReport().get_html()
+    assert reports.load_report_html("missing") is None
+
+
+def test_report_only_rendered_on_drift_or_request(monkeypatch):
+    monkeypatch.delenv("DRIFT_REPORT", raising=False)
+    assert reports.should_render_report(True)
+    assert not reports.should_render_report(False)
+
+    monkeypatch.setenv("DRIFT_REPORT", "1")
+    assert reports.should_render_report(False)
@@ -0,0 +1,159 @@
+import multiprocessing
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from monitoring.runner import Checkpoints, SkipStage, Stage, run_dag, run_in_process
+from src.instrumentation import REGISTRY
+
+
+def test_dag_runs_independent_stages_concurrently_and_isolates_failures():
+    started = threading.Barrier(2, timeout=5)
+
+    def a(_):
+        started.wait()  # only passes if b runs at the same time
+        return {"a": 1}
+
+    def b(_):
+        started.wait()
+        return {"b": 2}
+
+    def fails(_):
+        raise RuntimeError("boom")
+
+    def skip(_):
+        raise SkipStage("nothing to do")
+
+    results = run_dag(
+        [
+            Stage("a", a),
+            Stage("b", b),
+            Stage("sum", lambda d: d["a"]["a"] + d["b"]["b"], deps=("a", "b")),
+            Stage("fails", fails, deps=("a",)),
+            Stage("after_fail", lambda d: 1, deps=("fails",)),
+            Stage("skip", skip),
+            Stage("after_skip", lambda d: 1, deps=("skip",)),
+        ]
+    )
+
+    assert results["sum"].value == 3
+    assert results["fails"].status == "failed"
+    assert results["after_fail"].status == "skipped"
+    assert results["skip"].status == "skipped"
+    assert results["after_skip"].status == "skipped"
+
+
+def test_dag_resumes_from_checkpoints(tmp_path):
+    calls = []
+
+    def fetch(_):
+        calls.append("fetch")
+        return {"rows": [1, 2, 3], "_in_memory_only": object()}
+
+    def insert(deps):
+        calls.append("insert")
+        if calls.count("insert") == 1:
+            raise RuntimeError("first attempt fails")
+        return {"inserted": len(deps["fetch"]["rows"])}
+
+    def report(_):
+        calls.append("report")
+        raise SkipStage("not requested")
+
+    stages = [
+        Stage("fetch", fetch),
+        Stage("insert", insert, deps=("fetch",)),
+        Stage("report", report),
+    ]
+
+    first = run_dag(stages, Checkpoints(tmp_path, "run-1"))
+    second = run_dag(stages, Checkpoints(tmp_path, "run-1"))
+
+    assert first["insert"].status == "failed"
+    assert second["fetch"].status == "cached"
+    assert second["fetch"].value == {"rows": [1, 2, 3]}
+    assert second["insert"].value == {"inserted": 3}
+    # skipped stages are not checkpointed, so they get another chance
+    assert sorted(calls) == ["fetch", "insert", "insert", "report", "report"]
+
+
+def test_skipped_stage_is_not_counted_as_error():
+    def skip(_):
+        raise SkipStage("No drift detected.")
+
+    def fails(_):
+        raise RuntimeError("boom")
+
+    REGISTRY.reset()
+    run_dag([Stage("report", skip), Stage("insert", fails)])
+
+    counters = REGISTRY.to_dict()["counters"]
+    assert "monitoring_report_errors_total" not in counters
+    assert counters["monitoring_insert_errors_total"] == 1.0
+    REGISTRY.reset()
+
+
+def test_dag_rejects_unknown_dependencies():
+    with pytest.raises(ValueError, match="unknown"):
+        run_dag([Stage("a", lambda d: 1, deps=("missing",))])
+
+
+def test_run_in_process_returns_result_and_enforces_timeout():
+    assert run_in_process(sum, ([1, 2, 3],)) == 6
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        run_in_process(time.sleep, (30,), timeout=1)
+    assert time.monotonic() - start < 15
+
+
+def _start_pool_and_hang(pid_file: str) -> None:
+    # Runs in the spawned child: a busy pool like the CV one in src.train
+    pool = multiprocessing.Pool(2)
+    pool.map_async(time.sleep, [60, 60])
+    Path(pid_file).write_text(" ".join(str(p.pid) for p in multiprocessing.active_children()))
+    time.sleep(60)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        state = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[0]
+    except FileNotFoundError:
+        return False
+    return state != "Z"  # zombies are dead, just not reaped yet
+
+
+@pytest.mark.skipif(not Path("/proc").exists() or not hasattr(os, "killpg"), reason="POSIX only")
+def test_run_in_process_timeout_kills_grandchildren(tmp_path):
+    pid_file = tmp_path / "pids"
+
+    with pytest.raises(TimeoutError):
+        run_in_process(_start_pool_and_hang, (str(pid_file),), timeout=5)
+
+    pids = [int(p) for p in pid_file.read_text().split()]
+    assert len(pids) == 2
+
+    deadline = time.monotonic() + 5
+    while any(_alive(p) for p in pids) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert not any(_alive(p) for p in pids)
+
+
+def test_monitoring_checkpoints_hold_no_prediction_rows(tmp_path, monkeypatch):
+    from monitoring import retrain_if_needed as job
+
+    rows = [{"Age": 35, "Location": "Urban", "predicted_label": "SMS"}] * 3
+    monkeypatch.setattr(job, "fetch_recent_predictions", lambda window_days: rows)
+    monkeypatch.setattr(job, "load_reference", lambda: None)
+    monkeypatch.setattr(job, "compute_drift", lambda current, reference: (0.0, {"Age": False}, None))
+    monkeypatch.setattr(job, "insert_monitoring_metrics", lambda row: None)
+
+    results = run_dag(job.build_stages("run-1", 0.5, "v1"), Checkpoints(tmp_path, "run-1"))
+
+    assert results["insert_metrics"].status == "done"
+    saved = {p.name: p.read_text() for p in (tmp_path / "run-1").iterdir()}
+    assert "drift.json" in saved and "fetch.json" not in saved
+    assert not any("Urban" in text for text in saved.values())
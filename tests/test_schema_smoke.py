@@ -0,0 +1,61 @@
+import pandas as pd
+
+from src.config import DATASET_PATH, FEATURES
+from src.model_store import load_version
+from src.schema import compile_schema, validate
+from src.train import main as train_main
+
+VALID = {
+    "Age": 35,
+    "MotorValue": 15000,
+    "HealthDependentsAdults": 1,
+    "HealthDependentsKids": 0,
+    "CreditCardType": "visa",
+    "MotorType": "Single",
+    "HealthType": "Level3",
+    "TravelType": "Premium",
+    "MotorInsurance": "YES",
+    "HealthInsurance": "No",
+    "TravelInsurance": "No",
+    "Gender": "M",
+    "Location": "Urban",
+}
+
+
+def test_schema_validates_and_coerces_batches():
+    schema = compile_schema(load_version(train_main(cv=False)))
+
+    bad = {**VALID, "CreditCardType": "Vias", "Age": 12, "Gender": None, "MotorType": None}
+    result = validate(schema, pd.DataFrame([VALID, bad]))
+
+    assert result.valid.tolist() == [True, False]
+    assert result.errors.columns.tolist() == FEATURES
+    assert result.errors.iloc[1][["CreditCardType", "Age", "Gender"]].all()
+    # MotorType is imputed by the pipeline, so missing is allowed
+    assert not result.errors.iloc[1]["MotorType"]
+
+    first = result.records()[0]
+    assert first["CreditCardType"] == "Visa"
+    assert first["Gender"] == "male"
+    assert first["MotorInsurance"] == "Yes"
+    assert first["Age"] == 35.0
+
+    assert result.messages(1)[0] == "CreditCardType: invalid value 'Vias'"
+
+    # out-of-range floats are reported with the value the caller sent
+    too_high = validate(schema, pd.DataFrame([{**VALID, "MotorValue": 250000.0}]))
+    assert too_high.messages(0) == ["MotorValue: invalid value 250000.0"]
+
+    # empty batches are fine too
+    assert len(validate(schema, pd.DataFrame(columns=FEATURES)).frame) == 0
+
+
+def test_schema_accepts_clean_training_rows():
+    schema = compile_schema(load_version(train_main(cv=False)))
+    df = pd.read_csv(DATASET_PATH)
+
+    result = validate(schema, df)
+
+    # only the out-of-range Age / MotorValue rows the clamps exist for are rejected
+    rejected = result.errors[~result.valid]
+    assert set(rejected.columns[rejected.any()]) <= {"Age", "MotorValue"}
@@ -1,9 +1,58 @@
-from src.config import MODEL_META_PATH, MODEL_PATH
-from src.train import main as train_main
+import os
+import time
+
+import pytest
+
+from src import model_store
+from src.train import cross_validate, get_xy, load_dataset, main as train_main
 
 
 def test_training_creates_artifacts():
-    train_main()
+    version = train_main(cv=False)
+
+    assert model_store.get_champion_version() == version
+    manifest = model_store.verify_version(version)
+    assert set(manifest["files"]) == {"model.joblib", "model_meta.json", "explainer.joblib"}
+
+
+def test_stale_staging_directories_are_removed():
+    model_store.VERSIONS_DIR.mkdir(parents=True)
+    stale = model_store.VERSIONS_DIR / ".staging-killed"
+    fresh = model_store.VERSIONS_DIR / ".staging-in-progress"
+    stale.mkdir()
+    fresh.mkdir()
+    old = time.time() - model_store.STALE_STAGING_SECONDS - 1
+    os.utime(stale, (old, old))
+
+    version = train_main(cv=False)
+
+    assert not stale.exists() and fresh.exists()
+    assert model_store.list_versions() == [version]
+
+
+def test_corrupted_version_is_rejected():
+    version = train_main(cv=False)
+    model_file = model_store.version_dir(version) / "model.joblib"
+    model_file.write_bytes(model_file.read_bytes()[:-10])
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        model_store.load_version(version)
+
+
+def test_training_records_cross_validation():
+    version = train_main()
+
+    cv = model_store.load_version_meta(version)["cv"]
+    assert cv["completed_folds"] == cv["n_splits"] == 5
+    assert 0.0 <= cv["balanced_accuracy_mean"] <= 1.0
+    assert set(cv["recall_by_class"]) == {"Email", "Phone", "SMS"}
+
+
+def test_cross_validation_respects_time_budget():
+    X, y = get_xy(load_dataset())
+
+    cv = cross_validate(X, y, n_splits=3, max_seconds=0.01)
 
-    assert MODEL_PATH.exists()
-    assert MODEL_META_PATH.exists()
+    assert cv["completed_folds"] == 0
+    assert cv["balanced_accuracy_mean"] is None
+    assert cv["wall_seconds"] < 5